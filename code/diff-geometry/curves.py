@@ -0,0 +1,77 @@
+import numpy as np
+
+# Curves and surfaces drawn by the scenes in diff-geometry.py, kept free of
+# manim so they can be evaluated (and batched) on their own. Every function
+# accepts a scalar or an array of parameters and returns points with a
+# trailing coordinate axis.
+
+
+def _points(x, y, z=0.0):
+    x, y, z = np.broadcast_arrays(x, y, z)
+    return np.stack([x, y, z], axis=-1).astype(float)
+
+
+def ellipse_points(t, a, b):
+    """Points (a cos t, b sin t, 0) on an axis-aligned ellipse."""
+    t = np.asarray(t, dtype=float)
+    return _points(a * np.cos(t), b * np.sin(t))
+
+
+def blob_curve(t, base_radius=4.0):
+    """Irregular closed blob used as the phase-space region, t in [0, 2 pi]."""
+    t = np.asarray(t, dtype=float)
+    radius = base_radius + 0.4 * (np.sin(3*t) + 0.5*np.sin(7*t) + 0.3*np.sin(11*t))
+    return _points(radius * np.cos(t), radius * np.sin(t))
+
+
+def integral_curve(s, start=(-1.5, -1.0), end=(2.0, 1.5)):
+    """Curved path from `start` to `end`, s in [0, 1]."""
+    s = np.asarray(s, dtype=float)
+    x = start[0] + (end[0] - start[0]) * s + 0.8 * np.sin(np.pi * s) * (1 - s)
+    y = start[1] + (end[1] - start[1]) * s + 0.6 * np.cos(np.pi * s) * s
+    return _points(x, y)
+
+
+def base_curve(t):
+    """Gently arched base curve of the cosphere bundle, t in [0, 1]."""
+    t = np.asarray(t, dtype=float)
+    return _points(5 * t - 2.5, 0.8 * np.sin(t * np.pi))
+
+
+def magnetic_helix(t, start=0.5, length=2.3, radius=0.25, frequency=8):
+    """Helix winding around the line y = x, as (x, y) axis coordinates, t in [0, 1]."""
+    t = np.asarray(t, dtype=float)
+    # Base line: y = x (45 degrees)
+    base = start + t * length
+
+    offset_x = radius * np.cos(frequency * 2 * np.pi * t)
+    offset_y = radius * np.sin(frequency * 2 * np.pi * t)
+
+    # Rotate the offset to be perpendicular to the 45-degree line
+    x = base + (offset_x - offset_y) / np.sqrt(2)
+    y = base + (offset_x + offset_y) / np.sqrt(2)
+    return np.stack([x, y], axis=-1)
+
+
+def cone_surface(u, v):
+    """Double light cone: radius |v| at height v, angle u."""
+    u, v = np.asarray(u, dtype=float), np.asarray(v, dtype=float)
+    r = np.abs(v)
+    return _points(r * np.cos(u), r * np.sin(u), v)
+
+
+def coil_curve(t, start, end, amplitude, turns):
+    """Points of a drawn coil spring between `start` and `end`, t in [0, 1].
+
+    The coil is a sine wave of `turns` periods and the given amplitude,
+    perpendicular to the spring axis in the xy-plane. Same as
+    simulation/springs.py's coil_curve; this directory keeps its own copy.
+    """
+    t = np.asarray(t, dtype=float)[..., None]
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    axis = end - start
+    perpendicular = np.array([-axis[1], axis[0], 0.0])
+    norm = np.linalg.norm(perpendicular)
+    perpendicular = perpendicular / norm if norm > 0 else np.array([0.0, 1.0, 0.0])
+    points = start + t * axis + amplitude * np.sin(2 * np.pi * turns * t) * perpendicular
+    return points
@@ -1,6 +1,9 @@
 from manim import *
 import numpy as np
 
+from curves import base_curve, blob_curve, coil_curve, cone_surface, ellipse_points, integral_curve, magnetic_helix
+from glyphs import VectorFieldGlyphs, coords_to_points
+
 class SpringMassSystemBase(Scene):
     def __init__(self, theme="light", **kwargs):
         super().__init__(**kwargs)
@@ -28,13 +31,8 @@ class SpringMassSystemBase(Scene):
         num_coils = 12
         amplitude = 0.5
         
-        def spring_func(t):
-            x = t * spring_length
-            y = amplitude * np.sin(num_coils * 2 * PI * t)
-            return np.array([x, y, 0])
-        
         spring = ParametricFunction(
-            spring_func,
+            lambda t: coil_curve(t, ORIGIN, [spring_length, 0, 0], amplitude, num_coils),
             t_range=[0, 1, 0.005],
             stroke_width=4,
             color=self.spring_color
@@ -226,11 +224,7 @@ class CylindricalCrossProductBase(Scene):
         for i in range(num_lines):
             t = i * 2 * PI / num_lines
             
-            ellipse_point = np.array([
-                a * np.cos(t),
-                b * np.sin(t),
-                0
-            ])
+            ellipse_point = ellipse_points(t, a, b)
             
             line_start = ellipse_point - line_length * perspective_direction
             line_end = ellipse_point + line_length * perspective_direction
@@ -281,7 +275,7 @@ class CylindricalCrossProductBase(Scene):
         for i in range(num_surface_lines):
             t = i * 2 * PI / num_surface_lines
             
-            middle_point = np.array([a * np.cos(t), b * np.sin(t), 0])
+            middle_point = ellipse_points(t, a, b)
             top_point = middle_point + line_length * perspective_direction
             bottom_point = middle_point - line_length * perspective_direction
             
@@ -471,16 +465,8 @@ class HamiltonianVectorFieldBase(Scene):
             self.label_color = BLACK
 
     def construct(self):
-        def blob_func(t):
-            base_radius = 4.0
-            irregularity = 0.4 * (np.sin(3*t) + 0.5*np.sin(7*t) + 0.3*np.sin(11*t))
-            radius = base_radius + irregularity
-            x = radius * np.cos(t)
-            y = radius * np.sin(t)
-            return np.array([x, y, 0])
-        
         blob = ParametricFunction(
-            blob_func,
+            blob_curve,
             t_range=[0, 2*PI, 0.05],
             color=self.blob_color,
             fill_color=self.blob_fill_color,
@@ -517,27 +503,18 @@ class HamiltonianVectorFieldBase(Scene):
                 label.next_to(vector_end, direction=vector_direction, buff=0.15)
                 vector_labels.add(label)
         
-        def integral_curve_func(s):
-            start_x, start_y = -1.5, -1.0
-            end_x, end_y = 2.0, 1.5
-            
-            t = s
-            x = start_x + (end_x - start_x) * t + 0.8 * np.sin(PI * t) * (1 - t)
-            y = start_y + (end_y - start_y) * t + 0.6 * np.cos(PI * t) * t
-            return np.array([x, y, 0])
-        
-        integral_curve = ParametricFunction(
-            integral_curve_func,
+        integral_curve_mobject = ParametricFunction(
+            integral_curve,
             t_range=[0, 1, 0.01],
             color=self.curve_color,
             stroke_width=4
         )
         
-        m_point = integral_curve_func(0.2)
+        m_point = integral_curve(0.2)
         m_dot = Dot(m_point, radius=0.08, color=self.point_color)
         m_label = MathTex("m", font_size=28, color=self.point_color).next_to(m_dot, DOWN, buff=0.2)
         
-        mt_point = integral_curve_func(0.7)
+        mt_point = integral_curve(0.7)
         mt_dot = Dot(mt_point, radius=0.08, color=self.point_color)
         mt_label = MathTex("m(t)", font_size=28, color=self.point_color).next_to(mt_dot, UP, buff=0.2)
         
@@ -547,7 +524,7 @@ class HamiltonianVectorFieldBase(Scene):
         curve_full_label.to_edge(UP, buff=0.7)
         
         everything = VGroup(
-            blob, vectors, vector_labels, integral_curve,
+            blob, vectors, vector_labels, integral_curve_mobject,
             m_dot, m_label, mt_dot, mt_label,
             curve_full_label
         )
@@ -722,7 +699,6 @@ class DegreeOneFlowBase(Scene):
         x_label = MathTex("q", font_size=48, color=self.label_color).next_to(axes.x_axis.get_end(), RIGHT, buff=0.3)
         y_label = MathTex("p", font_size=48, color=self.label_color).next_to(axes.y_axis.get_end(), LEFT, buff=0.3)
         
-        arrows = VGroup()
         num_arrows_x = 11
         num_arrows_y = 8
         arrow_length = 0.55
@@ -730,23 +706,23 @@ class DegreeOneFlowBase(Scene):
         x_range = [-3.7, 3.7]
         y_range = [-2.7, 2.7]
         
-        for i in range(num_arrows_x):
-            for j in range(num_arrows_y):
-                x_pos = x_range[0] + i * (x_range[1] - x_range[0]) / (num_arrows_x - 1)
-                y_pos = y_range[0] + j * (y_range[1] - y_range[0]) / (num_arrows_y - 1)
-                
-                arrow_start = axes.c2p(x_pos, y_pos)
-                arrow_end = axes.c2p(x_pos + arrow_length, y_pos)
-                
-                arrow = Arrow(
-                    arrow_start,
-                    arrow_end,
-                    color=self.arrow_color,
-                    stroke_width=3,
-                    max_tip_length_to_length_ratio=0.2,
-                    buff=0
-                )
-                arrows.add(arrow)
+        # Grid of base points, every arrow pointing along +q
+        x_pos, y_pos = np.meshgrid(
+            np.linspace(*x_range, num_arrows_x),
+            np.linspace(*y_range, num_arrows_y),
+            indexing="ij",
+        )
+        base_coords = np.column_stack([x_pos.ravel(), y_pos.ravel()])
+        arrow_starts = coords_to_points(axes, base_coords)
+        arrow_ends = coords_to_points(axes, base_coords + [arrow_length, 0])
+        
+        arrows = VectorFieldGlyphs(
+            arrow_starts,
+            arrow_ends - arrow_starts,
+            color=self.arrow_color,
+            stroke_width=3,
+            max_tip_length_to_length_ratio=0.2,
+        )
         
         self.add(axes)
         self.add(x_label)
@@ -787,13 +763,8 @@ class CosphereBundleBase(Scene):
             self.label_color = BLACK
 
     def construct(self):
-        def curve_q(t):
-            x = 5 * t - 2.5
-            y = 0.8 * np.sin(t * PI)
-            return np.array([x, y, 0])
-        
         curve = ParametricFunction(
-            curve_q,
+            base_curve,
             t_range=[0, 1, 0.01],
             color=self.curve_color,
             stroke_width=5
@@ -811,10 +782,10 @@ class CosphereBundleBase(Scene):
         
         for i in range(num_planes):
             t_param = i * 1.0 / (num_planes - 1)
-            point_on_curve = curve_q(t_param)
+            point_on_curve = base_curve(t_param)
             
             dt = 0.01
-            tangent_vec = (curve_q(t_param + dt) - curve_q(t_param - dt)) / (2 * dt)
+            tangent_vec = (base_curve(t_param + dt) - base_curve(t_param - dt)) / (2 * dt)
             tangent_vec = tangent_vec / np.linalg.norm(tangent_vec[:2])
             
             normal_vec = np.array([-tangent_vec[1], tangent_vec[0], 0])
@@ -871,7 +842,7 @@ class CosphereBundleBase(Scene):
                 line = Line(point1, point2, color=self.cosphere_color, stroke_width=2, stroke_opacity=0.7)
                 cosphere_lines.add(line)
         
-        q_point = curve_q(0.5)
+        q_point = base_curve(0.5)
         q_label = MathTex("Q", font_size=FONT_SIZE, color=self.curve_color)
         q_label.move_to(q_point + DOWN * 1.8)
         q_arrow = Arrow(q_label.get_top(), q_point + DOWN * 0.1, color=self.curve_color, stroke_width=3, max_tip_length_to_length_ratio=0.15)
@@ -1133,29 +1104,8 @@ class GeodesicComparisonBase(Scene):
         )
         
         # Red curve winding around the dashed line
-        def magnetic_curve(t):
-            # Base line: y = x (45 degrees)
-            base_x = 0.5 + t * 2.3
-            base_y = 0.5 + t * 2.3
-            
-            # Add helical winding
-            radius = 0.25
-            frequency = 8
-            offset_x = radius * np.cos(frequency * 2 * PI * t)
-            offset_y = radius * np.sin(frequency * 2 * PI * t)
-            
-            # Rotate the offset to be perpendicular to the 45-degree line
-            rotated_offset_x = (offset_x - offset_y) / np.sqrt(2)
-            rotated_offset_y = (offset_x + offset_y) / np.sqrt(2)
-            
-            point = right_axes.c2p(
-                base_x + rotated_offset_x,
-                base_y + rotated_offset_y
-            )
-            return point
-        
         magnetic_geodesic = ParametricFunction(
-            magnetic_curve,
+            lambda t: right_axes.c2p(*magnetic_helix(t)),
             t_range=[0, 1, 0.005],
             color=self.magnetic_curve_color,
             stroke_width=3
@@ -1207,14 +1157,6 @@ class LightConeBase(ThreeDScene):
         self.set_camera_orientation(phi=70 * DEGREES, theta=-45 * DEGREES)
         
         # Create the double cone (light cone)
-        def cone_surface(u, v):
-            t = v
-            r = abs(t)
-            x = r * np.cos(u)
-            y = r * np.sin(u)
-            z = t
-            return np.array([x, y, z])
-        
         # Upper cone
         upper_cone = Surface(
             lambda u, v: cone_surface(u, v),
@@ -0,0 +1,103 @@
+from manim import *
+import numpy as np
+
+# Batched arrow glyphs for the vector-field scenes in diff-geometry.py: NumPy
+# arrays become scene geometry in one shot instead of one mobject per arrow.
+#
+# Copy of axes_transform, coords_to_points and VectorFieldGlyphs from
+# simulation/mobjects.py. Each scene directory is rendered on its own with
+# `manim <file>.py` and imports only its own modules, so the two copies are kept
+# on purpose; change both together.
+
+
+def axes_transform(axes):
+    """Return (origin, basis) such that points = origin + coords @ basis.
+
+    Only valid for linearly scaled axes, which is what every scene here uses.
+    """
+    origin = np.asarray(axes.coords_to_point(0, 0), dtype=float)
+    basis = np.array([
+        np.asarray(axes.coords_to_point(1, 0), dtype=float) - origin,
+        np.asarray(axes.coords_to_point(0, 1), dtype=float) - origin,
+    ])
+    return origin, basis
+
+
+def coords_to_points(axes, coords):
+    """Map an (N, 2) array of axis coordinates to (N, 3) scene points with one affine transform."""
+    origin, basis = axes_transform(axes)
+    return origin + np.asarray(coords, dtype=float) @ basis
+
+
+class VectorFieldGlyphs(VMobject):
+    """All arrows of a vector field as a single VMobject.
+
+    `starts` and `vectors` are (N, 2) or (N, 3) arrays in scene coordinates. Every
+    glyph contributes one straight shaft and one filled triangular tip as separate
+    subpaths of the same VMobject, so a dense field is one mobject for the
+    renderer instead of thousands of Arrow submobjects. Tips are sized like
+    Arrow's: min(tip_length, max_tip_length_to_length_ratio * length).
+    """
+
+    def __init__(
+        self,
+        starts,
+        vectors,
+        tip_length=DEFAULT_ARROW_TIP_LENGTH,
+        max_tip_length_to_length_ratio=0.25,
+        tip_width_ratio=1.0,
+        color=WHITE,
+        stroke_width=2,
+        stroke_opacity=1.0,
+        fill_opacity=None,
+        **kwargs,
+    ):
+        super().__init__(
+            color=color,
+            stroke_width=stroke_width,
+            stroke_opacity=stroke_opacity,
+            fill_opacity=stroke_opacity if fill_opacity is None else fill_opacity,
+            **kwargs,
+        )
+        self.set_points(self.glyph_points(
+            starts, vectors, tip_length, max_tip_length_to_length_ratio, tip_width_ratio
+        ))
+
+    @staticmethod
+    def glyph_points(starts, vectors, tip_length, max_tip_length_to_length_ratio, tip_width_ratio):
+        starts = _as_points3d(starts)
+        vectors = _as_points3d(vectors)
+        ends = starts + vectors
+
+        length = np.linalg.norm(vectors, axis=1, keepdims=True)
+        direction = np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+        # In-plane perpendicular for the tip's base
+        normal = np.stack([-direction[:, 1], direction[:, 0], np.zeros(len(direction))], axis=1)
+
+        tip = np.minimum(tip_length, max_tip_length_to_length_ratio * length)
+        bases = ends - tip * direction
+        left = bases + 0.5 * tip_width_ratio * tip * normal
+        right = bases - 0.5 * tip_width_ratio * tip * normal
+
+        # Four straight cubic curves per glyph: the shaft, then the closed tip triangle
+        anchors = np.stack([
+            starts, bases,
+            ends, left,
+            left, right,
+            right, ends,
+        ], axis=1).reshape(len(starts), 4, 2, 3)
+        curve_start, curve_end = anchors[:, :, 0], anchors[:, :, 1]
+        curves = np.stack([
+            curve_start,
+            curve_start + (curve_end - curve_start) / 3,
+            curve_start + 2 * (curve_end - curve_start) / 3,
+            curve_end,
+        ], axis=2)
+        return curves.reshape(-1, 3)
+
+
+def _as_points3d(array):
+    array = np.asarray(array, dtype=float)
+    if array.shape[1] == 3:
+        return array
+    return np.column_stack([array, np.zeros(len(array))])
@@ -0,0 +1,183 @@
+import numpy as np
+import scipy.sparse as sp
+
+from coloring import scatter_batches
+
+# Global stiffness assembly  K = sum_j E_j^T K_j E_j  for linear mass-spring meshes.
+#
+# Spring j connects nodes (a, b) and contributes the element matrix
+#   K_j = k_j * [[ 1, -1],
+#                [-1,  1]]  (kron)  I_dim
+# to the rows and columns of both nodes. Instead of looping over springs, all
+# 4 * dim entries of every element are written as COO triplets in one go and
+# duplicate (row, col) pairs are summed when converting to CSR.
+
+
+def element_triplets(edges, stiffness, dofs_per_node=1):
+    """Return the (rows, cols, values) COO triplets of every spring's K_j."""
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    stiffness = np.broadcast_to(np.asarray(stiffness, dtype=float), (len(edges),))
+
+    # DOF indices of both endpoints: shape (E, 2 * dim), ordered [a_0..a_d, b_0..b_d]
+    offsets = np.arange(dofs_per_node)
+    dofs = (edges[:, :, None] * dofs_per_node + offsets).reshape(len(edges), -1)
+
+    local_rows, local_cols, local_values = _local_pattern(dofs_per_node)
+    rows = dofs[:, local_rows].ravel()
+    cols = dofs[:, local_cols].ravel()
+    values = (stiffness[:, None] * local_values).ravel()
+    return rows, cols, values
+
+
+def _local_pattern(dofs_per_node):
+    # Nonzeros of the element pattern [[1, -1], [-1, 1]] (kron) I_dim, shared by every spring
+    local = np.kron(np.array([[1.0, -1.0], [-1.0, 1.0]]), np.eye(dofs_per_node))
+    local_rows, local_cols = np.nonzero(local)
+    return local_rows, local_cols, local[local_rows, local_cols]
+
+
+def assemble_stiffness(edges, stiffness, num_nodes=None, dofs_per_node=1):
+    """Assemble the global stiffness matrix of a linear spring mesh as CSR.
+
+    `edges` is an (E, 2) array of node indices and `stiffness` a scalar or an
+    (E,) array of spring constants. The result is a symmetric
+    (num_nodes * dofs_per_node) square matrix.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if num_nodes is None:
+        num_nodes = int(edges.max()) + 1 if len(edges) else 0
+    size = num_nodes * dofs_per_node
+
+    rows, cols, values = element_triplets(edges, stiffness, dofs_per_node)
+    # COO -> CSR sums the duplicate entries, which is exactly the scatter-add
+    return sp.coo_matrix((values, (rows, cols)), shape=(size, size)).tocsr()
+
+
+def assemble_stiffness_slots(edges, stiffness, num_nodes=None, dofs_per_node=1):
+    """Assemble K like assemble_stiffness and map every spring to its K.data entries.
+
+    Returns (K, slots): `slots` is an (E, 4 * dofs_per_node) array and
+    K.data[slots[j]] are the entries spring j contributes to, in the order of
+    element_triplets. Pass both to update_stiffness to change spring constants
+    without re-assembling. The sort that builds the map is paid once, here.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if num_nodes is None:
+        num_nodes = int(edges.max()) + 1 if len(edges) else 0
+    size = num_nodes * dofs_per_node
+
+    rows, cols, values = element_triplets(edges, stiffness, dofs_per_node)
+    # Row-major (row, col) keys sort exactly like canonical CSR storage
+    keys, slots = np.unique(rows * size + cols, return_inverse=True)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // size, minlength=size), out=indptr[1:])
+    data = np.bincount(slots.ravel(), values, minlength=len(keys))
+    matrix = sp.csr_matrix((data, keys % size, indptr), shape=(size, size))
+    return matrix, slots.reshape(len(edges), -1)
+
+
+def update_stiffness(matrix, slots, springs, delta, dofs_per_node=1):
+    """Add `delta` to the spring constants of `springs`, writing into matrix.data in place.
+
+    `matrix` and `slots` come from assemble_stiffness_slots; `delta` is a scalar
+    or one change per listed spring. Costs O(len(springs)): the sparsity pattern
+    is untouched, so anything sharing the matrix sees the new values, while
+    factorizations of it have to be redone.
+    """
+    springs = np.asarray(springs, dtype=np.int64).ravel()
+    delta = np.broadcast_to(np.asarray(delta, dtype=float), springs.shape)
+    local_values = _local_pattern(dofs_per_node)[2]
+    # Springs sharing a node hit the same diagonal slot, so accumulate with add.at
+    np.add.at(matrix.data, slots[springs].ravel(), (delta[:, None] * local_values).ravel())
+    return matrix
+
+
+def lumped_mass(masses, num_nodes, dofs_per_node=1):
+    """Diagonal (lumped) mass matrix from a scalar or per-node mass array."""
+    masses = np.broadcast_to(np.asarray(masses, dtype=float), (num_nodes,))
+    return sp.diags(np.repeat(masses, dofs_per_node), format="csr")
+
+
+def assemble_blocks(edges, blocks, num_nodes):
+    """Assemble per-spring d x d blocks H_j into a global sparse matrix.
+
+    Each spring contributes [[H_j, -H_j], [-H_j, H_j]] to the rows and columns of
+    its two nodes, which is how the Hessian of a spring energy is laid out.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    blocks = np.asarray(blocks, dtype=float)
+    dim = blocks.shape[-1]
+    size = num_nodes * dim
+
+    # Row/column DOFs of every entry in a d x d block, shape (E, d, d)
+    offsets = np.arange(dim)
+    a = edges[:, 0, None] * dim + offsets
+    b = edges[:, 1, None] * dim + offsets
+    row_a, col_a = np.broadcast_arrays(a[:, :, None], a[:, None, :])
+    row_b, col_b = np.broadcast_arrays(b[:, :, None], b[:, None, :])
+    rows = np.concatenate([row_a, row_a, row_b, row_b], axis=None)
+    cols = np.concatenate([col_a, col_b, col_a, col_b], axis=None)
+    values = np.concatenate([blocks, -blocks, -blocks, blocks], axis=None)
+    return sp.coo_matrix((values, (rows, cols)), shape=(size, size)).tocsr()
+
+
+def assemble_blocks_slots(edges, num_nodes, dim=3):
+    """Sparsity pattern of assemble_blocks and the H.data entry of every block entry.
+
+    Returns (H, slots): H is the assembled pattern with zero values and `slots`
+    is (E, 4, dim, dim), the H.data index of each entry of spring j's blocks in
+    the order (a, a), (a, b), (b, a), (b, b). Pass both to update_blocks to refill
+    H for new blocks without rebuilding the pattern.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    size = num_nodes * dim
+
+    offsets = np.arange(dim)
+    a = edges[:, 0, None] * dim + offsets
+    b = edges[:, 1, None] * dim + offsets
+    rows = np.stack([a, a, b, b], axis=1)[:, :, :, None]
+    cols = np.stack([a, b, a, b], axis=1)[:, :, None, :]
+    keys, slots = np.unique(rows * size + cols, return_inverse=True)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // size, minlength=size), out=indptr[1:])
+    matrix = sp.csr_matrix((np.zeros(len(keys)), keys % size, indptr), shape=(size, size))
+    return matrix, slots.reshape(len(edges), 4, dim, dim)
+
+
+def update_blocks(matrix, slots, blocks, batches=None, workers=None):
+    """Overwrite matrix.data with the assembly of new (E, d, d) blocks, in place.
+
+    `matrix` and `slots` come from assemble_blocks_slots. By default all entries
+    are summed with one bincount. With node-disjoint `batches` (see
+    coloring.color_batches) they are added batch by batch on `workers` threads
+    instead: within a batch no spring shares a diagonal block with another, and
+    every off-diagonal block belongs to a single spring.
+    """
+    blocks = np.asarray(blocks, dtype=float)
+    values = np.stack([blocks, -blocks, -blocks, blocks], axis=1).reshape(len(blocks), -1)
+    targets = slots.reshape(len(slots), -1)
+    if batches is None:
+        matrix.data[:] = np.bincount(targets.ravel(), values.ravel(), minlength=len(matrix.data))
+    else:
+        matrix.data[:] = 0.0
+        scatter_batches(matrix.data, targets, values, batches, workers)
+    return matrix
+
+
+def sparsity_raster(matrix, pixels=512):
+    """Boolean image of a sparse matrix's nonzero pattern, row 0 at the top.
+
+    Matrices larger than `pixels` are max-pooled: a pixel is set when any entry
+    of the block of rows and columns it covers is nonzero. Smaller matrices get
+    one pixel per entry, to be scaled up with nearest-neighbour resampling.
+    """
+    coo = sp.coo_matrix(matrix)
+    num_rows, num_cols = coo.shape
+    mask = coo.data != 0
+    rows, cols = coo.row[mask], coo.col[mask]
+
+    height, width = min(num_rows, pixels), min(num_cols, pixels)
+    image = np.zeros((height, width), dtype=bool)
+    # Integer bin of every entry; equivalent to max-pooling the 0/1 pattern
+    image[rows.astype(np.int64) * height // num_rows, cols.astype(np.int64) * width // num_cols] = True
+    return image
@@ -0,0 +1,302 @@
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from assembly import assemble_blocks, assemble_blocks_slots, assemble_stiffness, lumped_mass, update_blocks
+from coloring import color_batches, grid_edge_colors, parallel_scatter_add
+from constraints import PinConstraints
+from implicit import BackwardEulerSolver
+from iterative import ConjugateGradientSolver
+from integrators import METHODS, advance, harmonic_energy, harmonic_solution
+from mesh import grid_edges, grid_mesh
+from newton import NewtonSolver
+from oscillators import OscillatorBatch
+from springs import scatter_edge_vectors, spring_forces
+from stability import SCHEMES, complex_grid, spectral_radius
+
+# Standalone benchmarks for the numerics behind simulation.py.
+# Usage: python benchmarks.py {assembly,springs,topology} [--sizes 64 256 1024]
+#        python benchmarks.py coloring [--sizes 1024] [--threads 1 2 4 8]
+#        python benchmarks.py {oscillator,mesh} [--steps 10000000]
+#        python benchmarks.py newton [--mesh-sizes 16 32] [--frames 30]
+#        python benchmarks.py pcg [--sizes 128 512] [--frames 30]
+#        python benchmarks.py batch [--batches 1000 1000000]
+#        python benchmarks.py stability [--resolution 4096]
+
+
+def measure(func, *args, repeats=3, **kwargs):
+    """Return (result, best wall time in seconds, peak traced memory in bytes)."""
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    # Memory is measured in a separate run so tracing does not skew the timings
+    return result, best, peak_memory(func, *args, **kwargs)
+
+
+def peak_memory(func, *args, **kwargs):
+    """Peak traced memory in bytes of a single call."""
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_assembly(args):
+    print(f"{'grid':>11} {'nodes':>10} {'springs':>10} {'nnz':>10} {'time [ms]':>10} {'peak [MB]':>10}")
+    for n in args.sizes:
+        edges = grid_edges(n, n)
+        stiffness = np.ones(len(edges))
+        K, seconds, peak = measure(assemble_stiffness, edges, stiffness, num_nodes=n * n)
+        print(f"{n:>5}x{n:<5} {n * n:>10} {len(edges):>10} {K.nnz:>10} {seconds * 1e3:>10.1f} {peak / 2**20:>10.1f}")
+
+
+def bench_springs(args):
+    print(f"{'grid':>11} {'springs':>10} {'kernel [ms]':>12} {'Hessian [ms]':>13} {'springs/s':>12}")
+    rng = np.random.default_rng(0)
+    for n in args.sizes:
+        edges = grid_edges(n, n)
+        positions = np.zeros((n * n, 3))
+        positions[:, 0], positions[:, 1] = np.divmod(np.arange(n * n), n)
+        positions += 0.05 * rng.standard_normal(positions.shape)
+
+        (_, _, blocks), kernel_seconds, _ = measure(spring_forces, positions, edges, 1.0, 1.0)
+        _, hessian_seconds, _ = measure(assemble_blocks, edges, blocks, n * n)
+        print(f"{n:>5}x{n:<5} {len(edges):>10} {kernel_seconds * 1e3:>12.1f} {hessian_seconds * 1e3:>13.1f} "
+              f"{len(edges) / kernel_seconds:>12.3g}")
+
+
+def bench_oscillator(args):
+    # Long-horizon runs of every registered integrator on the harmonic oscillator,
+    # compared against the analytic solution at the final time
+    dt, k_over_m = args.dt, 1.0
+    initial = np.tile([2.0, 0.0], (args.batch, 1))
+    exact = harmonic_solution(args.steps * dt, 2.0, 0.0, k_over_m)
+    energy0 = harmonic_energy(initial, k_over_m)
+
+    print(f"{args.steps} steps, dt={dt}, batch={args.batch}")
+    print(f"{'method':>18} {'steps/s':>12} {'peak [MB]':>10} {'energy drift':>13} {'state error':>12}")
+    for method in METHODS:
+        start = time.perf_counter()
+        with np.errstate(over="ignore", invalid="ignore"):
+            final = advance(initial, dt, args.steps, k_over_m, method)
+        seconds = time.perf_counter() - start
+        # Memory does not grow with the horizon, so a short run is representative
+        peak = peak_memory(advance, initial, dt, min(args.steps, 1000), k_over_m, method)
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            drift = np.max(np.abs(harmonic_energy(final, k_over_m) - energy0) / energy0)
+            error = np.max(np.linalg.norm(final - exact, axis=1)) / 2.0
+        print(f"{method:>18} {args.steps / seconds:>12.3g} {peak / 2**20:>10.2f} {drift:>13.3g} {error:>12.3g}")
+
+
+def _mesh_energy(K, mass, q, v, rest):
+    d = q - rest
+    return 0.5 * mass * np.dot(v, v) + 0.5 * np.dot(d, K @ d)
+
+
+def _run_mesh(K, mass, rest, q, v, dt, steps, method, solver=None):
+    if method == "backward_euler":
+        # The closed-form 1-DOF update does not apply to a coupled mesh
+        for _ in range(steps):
+            q, v = solver.step(q, v)
+        return q, v
+    final = advance(np.column_stack([q, v]), dt, steps, lambda x: -(K @ (x - rest)) / mass, method)
+    return final[:, 0], final[:, 1]
+
+
+def bench_mesh(args):
+    # Long-horizon runs of every registered integrator on small 1-DOF-per-node spring grids
+    dt, mass = args.dt, 1.0
+    rng = np.random.default_rng(0)
+    print(f"{args.steps} steps, dt={dt}")
+    print(f"{'grid':>7} {'method':>18} {'steps/s':>12} {'peak [MB]':>10} {'energy drift':>13}")
+    for n in args.mesh_sizes:
+        K = assemble_stiffness(grid_edges(n, n), 1.0, num_nodes=n * n)
+        solver = BackwardEulerSolver(K, lumped_mass(mass, n * n), dt)
+        rest = np.zeros(n * n)
+        q0, v0 = 0.5 * rng.standard_normal(n * n), np.zeros(n * n)
+        energy0 = _mesh_energy(K, mass, q0, v0, rest)
+
+        for method in METHODS:
+            start = time.perf_counter()
+            with np.errstate(over="ignore", invalid="ignore"):
+                q, v = _run_mesh(K, mass, rest, q0, v0, dt, args.steps, method, solver)
+                drift = abs(_mesh_energy(K, mass, q, v, rest) - energy0) / energy0
+            seconds = time.perf_counter() - start
+            peak = peak_memory(_run_mesh, K, mass, rest, q0, v0, dt, min(args.steps, 1000), method, solver)
+            print(f"{n:>3}x{n:<3} {method:>18} {args.steps / seconds:>12.3g} {peak / 2**20:>10.2f} {drift:>13.3g}")
+
+
+def bench_topology(args):
+    print(f"{'grid':>11} {'springs':>10} {'structural [ms]':>16} {'+shear+bending [ms]':>20} {'peak [MB]':>10}")
+    for n in args.sizes:
+        (_, edges, _), structural_seconds, _ = measure(grid_mesh, n, n)
+        (_, all_edges, _), all_seconds, peak = measure(grid_mesh, n, n, shear=True, bending=True)
+        print(f"{n:>5}x{n:<5} {len(all_edges):>10} {structural_seconds * 1e3:>16.1f} {all_seconds * 1e3:>20.1f} "
+              f"{peak / 2**20:>10.1f}")
+
+
+def bench_coloring(args):
+    # Serial bincount scatter against the colored, threaded scatter. Forces: spring_forces' scatter.
+    # Hessian: COO assembly, refilling a fixed pattern with one bincount, and the colored refill
+    rng = np.random.default_rng(0)
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'grid':>11} {'kind':>8} {'COO [ms]':>9} {'serial [ms]':>12} "
+          + " ".join(f"{f'{t} thr [ms]':>11}" for t in args.threads))
+    for n in args.sizes:
+        edges = grid_edges(n, n)
+        batches = color_batches(grid_edge_colors(n, n))
+        forces = rng.random((len(edges), 3))
+        _, serial_seconds, _ = measure(scatter_edge_vectors, edges, forces, n * n)
+        parallel = [measure(parallel_scatter_add, edges, forces, n * n, batches, workers=t)[1] for t in args.threads]
+        print(f"{n:>5}x{n:<5} {'forces':>8} {'':>9} {serial_seconds * 1e3:>12.2f} "
+              + " ".join(f"{seconds * 1e3:>11.2f}" for seconds in parallel))
+
+        blocks = rng.random((len(edges), 3, 3))
+        _, coo_seconds, _ = measure(assemble_blocks, edges, blocks, n * n)
+        hessian, slots = assemble_blocks_slots(edges, n * n)
+        _, serial_seconds, _ = measure(update_blocks, hessian, slots, blocks)
+        parallel = [measure(update_blocks, hessian, slots, blocks, batches, t)[1] for t in args.threads]
+        print(f"{n:>5}x{n:<5} {'hessian':>8} {coo_seconds * 1e3:>9.2f} {serial_seconds * 1e3:>12.2f} "
+              + " ".join(f"{seconds * 1e3:>11.2f}" for seconds in parallel))
+
+
+def _hanging_cloth(n, spacing=0.1):
+    # n x n grid in the xz-plane, pinned at its two top corners
+    _, edges, _ = grid_mesh(n, n, spacing, shear=True, bending=True)
+    nodes = np.zeros((n * n, 3))
+    nodes[:, 0], nodes[:, 2] = np.arange(n * n) % n * spacing, np.arange(n * n) // n * spacing
+    return nodes, edges, [n * n - n, n * n - 1]
+
+
+def bench_newton(args):
+    # Stiff hanging cloth under gravity: full Newton against the quasi-Newton mode
+    dt, mass, gravity = 1 / 30, 0.01, np.array([0.0, 0.0, -9.8])
+    print(f"{args.frames} frames, dt={dt:.4g}")
+    print(f"{'grid':>7} {'mode':>6} {'frames/s':>10} {'iterations':>11} {'factorizations':>15} {'sag':>8}")
+    for n in args.mesh_sizes:
+        nodes, edges, pins = _hanging_cloth(n)
+        for quasi in (False, True):
+            solver = NewtonSolver(nodes, edges, 1e3, mass, dt, constraints=PinConstraints(n * n, pins),
+                                  external_forces=mass * gravity, quasi=quasi)
+            start = time.perf_counter()
+            positions, _ = solver.simulate(nodes, np.zeros_like(nodes), args.frames)
+            seconds = time.perf_counter() - start
+            sag = nodes[:, 2].min() - positions[-1, :, 2].min()
+            print(f"{n:>3}x{n:<3} {'quasi' if quasi else 'full':>6} {args.frames / seconds:>10.3g} "
+                  f"{solver.iterations:>11} {solver.factorizations:>15} {sag:>8.3g}")
+
+
+def bench_pcg(args):
+    # Stiff 1-DOF-per-node grids pinned along one edge: direct factorization against
+    # matrix-free CG with each preconditioner, all warm-started from the previous step
+    dt, mass = args.dt, 1.0
+    stiffness = 1e3 * mass / dt**2
+    rng = np.random.default_rng(0)
+    print(f"{args.frames} steps, dt={dt}, dt^2 k / m = {dt**2 * stiffness / mass:g}")
+    print(f"{'grid':>11} {'solver':>10} {'setup [ms]':>11} {'iters/solve':>12} {'solve [ms]':>11} {'peak [MB]':>10}")
+    for n in args.sizes:
+        edges = grid_edges(n, n)
+        constraints = PinConstraints(n * n, range(n))
+        q0 = constraints.scatter(0.01 * rng.standard_normal(constraints.num_free), b=0.0)
+        v0 = np.zeros(n * n)
+        gravity = np.full(n * n, -9.8 * mass)
+
+        def direct():
+            K = assemble_stiffness(edges, stiffness, num_nodes=n * n)
+            return BackwardEulerSolver(K, lumped_mass(mass, n * n), dt, external_forces=gravity, constraints=constraints)
+
+        solvers = [("direct", direct)] + [
+            (name, lambda name=name: ConjugateGradientSolver(edges, stiffness, mass, dt, n * n, external_forces=gravity,
+                                                             constraints=constraints, preconditioner=name,
+                                                             grid_shape=(n, n)))
+            for name in ConjugateGradientSolver.PRECONDITIONERS
+        ]
+        for name, build in solvers:
+            solver, setup_seconds, _ = measure(build, repeats=1)
+            start = time.perf_counter()
+            solver.simulate(q0, v0, args.frames)
+            seconds = (time.perf_counter() - start) / args.frames
+            peak = peak_memory(lambda: build().simulate(q0, v0, 1))
+            iterations = np.mean(solver.iterations) if name != "direct" else float("nan")
+            print(f"{n:>5}x{n:<5} {name:>10} {setup_seconds * 1e3:>11.1f} {iterations:>12.1f} "
+                  f"{seconds * 1e3:>11.1f} {peak / 2**20:>10.1f}")
+
+
+def bench_batch(args):
+    # Structure-of-arrays oscillator batches: throughput against batch size and precision,
+    # with roughly the same number of oscillator-steps per run
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>10} {'dtype':>8} {'method':>17} {'steps':>8} {'osc-steps/s':>12} {'alloc/step [B]':>15}")
+    for size in args.batches:
+        steps = max(10, 2 * 10**7 // size)
+        for dtype in (np.float32, np.float64):
+            for method in OscillatorBatch.METHODS:
+                batch = OscillatorBatch(rng.standard_normal(size), 0.0, rng.uniform(0.5, 2.0, size),
+                                        rng.uniform(0.5, 2.0, size), rng.uniform(0.0, 0.1, size), dtype=dtype)
+                start = time.perf_counter()
+                batch.run(args.dt, steps, method)
+                seconds = time.perf_counter() - start
+                # Anything traced beyond the columns themselves is per-step allocation
+                allocated = peak_memory(batch.run, args.dt, 10, method) / 10
+                print(f"{size:>10} {np.dtype(dtype).name:>8} {method:>17} {steps:>8} {size * steps / seconds:>12.3g} "
+                      f"{allocated:>15.0f}")
+
+
+def bench_stability(args):
+    # Spectral-radius maps of every integrator over a resolution x resolution grid of lambda * dt
+    real_range, imag_range = (-4.0, 1.0), (-4.0, 4.0)
+    z = complex_grid(real_range, imag_range, args.resolution)
+    area = (real_range[1] - real_range[0]) * (imag_range[1] - imag_range[0])
+    print(f"{args.resolution}x{args.resolution} grid, Re in {list(real_range)}, Im in {list(imag_range)}")
+    print(f"{'method':>18} {'time [s]':>9} {'points/s':>10} {'stable area':>12}")
+    for method in SCHEMES:
+        start = time.perf_counter()
+        radius = spectral_radius(method, z)
+        seconds = time.perf_counter() - start
+        print(f"{method:>18} {seconds:>9.2f} {z.size / seconds:>10.3g} {np.mean(radius <= 1 + 1e-9) * area:>12.3f}")
+
+
+BENCHMARKS = {
+    "assembly": bench_assembly,
+    "springs": bench_springs,
+    "oscillator": bench_oscillator,
+    "mesh": bench_mesh,
+    "topology": bench_topology,
+    "coloring": bench_coloring,
+    "newton": bench_newton,
+    "pcg": bench_pcg,
+    "batch": bench_batch,
+    "stability": bench_stability,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the simulation numerics")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 128, 512, 1024],
+                        help="Grid side lengths (nodes per side)")
+    parser.add_argument("--steps", type=int, default=10**7, help="Time steps for the long-horizon runs")
+    parser.add_argument("--dt", type=float, default=0.01, help="Time step for the long-horizon runs")
+    parser.add_argument("--batch", type=int, default=1, help="Oscillators integrated side by side")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Thread counts for the parallel assembly runs")
+    parser.add_argument("--mesh-sizes", type=int, nargs="+", default=[4, 8],
+                        help="Grid side lengths for the mesh runs")
+    parser.add_argument("--batches", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6, 10**7],
+                        help="Oscillator counts for the structure-of-arrays runs")
+    parser.add_argument("--resolution", type=int, default=4096, help="Grid points per axis for the stability maps")
+    parser.add_argument("--frames", type=int, default=30, help="Time steps for the nonlinear mesh solvers")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
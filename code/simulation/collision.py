@@ -0,0 +1,116 @@
+import numpy as np
+
+from springs import spring_forces
+
+# Self-collision for mass-spring meshes: a spatial-hash broad phase and a
+# penalty narrow phase.
+#
+# Space is cut into cubic cells of side >= radius, so two nodes closer than
+# `radius` always lie in the same or in adjacent cells. Every node gets the
+# integer key of its cell, nodes are sorted by key once, and the nodes of any
+# cell are then a contiguous run of the sorted order found with searchsorted.
+# Pairs are generated per neighbour offset for all nodes at once; only half of
+# the 26 neighbours are visited so that every pair comes out exactly once.
+#
+# Contacts are penalty springs with rest length `radius` that only push: the
+# force and Hessian come straight from springs.spring_forces.
+
+# The cell itself plus the 13 neighbours that are lexicographically "after" it
+_HALF_NEIGHBOURHOOD = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                       if (dx, dy, dz) > (0, 0, 0)]
+
+
+def hash_cells(positions, cell_size):
+    """Cell keys of every node and the node order sorted by key.
+
+    Returns (keys, order, dims): `keys[n]` is the cell key of node n,
+    `order` sorts the nodes by key and `dims` is the padded number of cells per
+    axis, so the key of a neighbouring cell is keys + offset_key(offset, dims).
+    """
+    positions = np.asarray(positions, dtype=float)
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    # One empty layer on every side keeps neighbour keys from wrapping around
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    return keys, np.argsort(keys, kind="stable"), dims
+
+
+def _offset_key(offset, dims):
+    dx, dy, dz = offset
+    return (dx * dims[1] + dy) * dims[2] + dz
+
+
+def _expand_ranges(starts, ends):
+    # For every i, all j in [starts[i], ends[i]) as two flat arrays (i, j)
+    counts = ends - starts
+    owner = np.repeat(np.arange(len(starts)), counts)
+    first = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return owner, np.arange(len(owner)) + first
+
+
+def candidate_pairs(positions, radius, cell_size=None, exclude=None):
+    """(P, 2) node pairs closer than `radius`, found with a uniform-grid spatial hash.
+
+    Runs in roughly O(N + P) for meshes whose density per cell is bounded.
+    `exclude` is an optional (E, 2) edge list, typically the mesh springs, whose
+    node pairs are dropped from the result.
+    """
+    positions = np.asarray(positions, dtype=float)
+    num_nodes = len(positions)
+    cell_size = radius if cell_size is None else max(cell_size, radius)
+    if num_nodes < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    keys, order, dims = hash_cells(positions, cell_size)
+    sorted_keys = keys[order]
+    sorted_positions = positions[order]
+
+    pairs = []
+    for offset in [(0, 0, 0)] + _HALF_NEIGHBOURHOOD:
+        if offset == (0, 0, 0):
+            # Same cell: only the nodes after this one in sorted order
+            starts = np.arange(1, num_nodes + 1)
+            ends = np.searchsorted(sorted_keys, sorted_keys, side="right")
+        else:
+            neighbour = sorted_keys + _offset_key(offset, dims)
+            starts = np.searchsorted(sorted_keys, neighbour, side="left")
+            ends = np.searchsorted(sorted_keys, neighbour, side="right")
+        a, b = _expand_ranges(starts, ends)
+        d = sorted_positions[a] - sorted_positions[b]
+        close = np.einsum("ij,ij->i", d, d) < radius**2
+        pairs.append(np.stack([order[a[close]], order[b[close]]], axis=1))
+    pairs = np.concatenate(pairs)
+
+    if exclude is not None and len(pairs):
+        exclude = np.asarray(exclude, dtype=np.int64).reshape(-1, 2)
+        pair_keys = pairs.min(axis=1) * num_nodes + pairs.max(axis=1)
+        edge_keys = exclude.min(axis=1) * num_nodes + exclude.max(axis=1)
+        pairs = pairs[~np.isin(pair_keys, edge_keys)]
+    return pairs
+
+
+def contact_forces(positions, pairs, stiffness, radius, hessians=False):
+    """Penalty forces of colliding pairs, in the format of springs.spring_forces.
+
+    Every pair closer than `radius` acts as a compressed spring of rest length
+    `radius`, pushing the nodes apart with energy 1/2 k (radius - d)^2. Pairs
+    further apart contribute nothing. Returns (forces, energy, blocks) with the
+    (1 - l0 / l) Hessian term clamped, so blocks are positive semi-definite.
+    """
+    positions = np.asarray(positions, dtype=float)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    d = positions[pairs[:, 0]] - positions[pairs[:, 1]]
+    touching = np.einsum("ij,ij->i", d, d) < radius**2
+    stiffness = np.broadcast_to(np.asarray(stiffness, dtype=float), (len(pairs),))[touching]
+    return spring_forces(positions, pairs[touching], stiffness, radius, hessians=hessians, definite=True)
+
+
+def self_collision_forces(positions, edges, stiffness, radius, hessians=False):
+    """Broad and narrow phase in one call: contact forces between non-adjacent nodes.
+
+    Returns ((forces, energy, blocks), pairs); add the forces to those of
+    spring_forces, and assemble the blocks over `pairs` when `hessians` is set.
+    """
+    pairs = candidate_pairs(positions, radius, exclude=edges)
+    return contact_forces(positions, pairs, stiffness, radius, hessians), pairs
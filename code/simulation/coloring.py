@@ -0,0 +1,139 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Edge coloring for race-free parallel assembly.
+#
+# Spring assembly is a scatter-add into per-node slots, and two springs that
+# share a node write to the same slot. Coloring the edges so that every color
+# class is node-disjoint (a matching) removes those conflicts: within a batch
+# each node is written at most once, so the batch can be split across threads
+# with plain fancy-index updates and no locks. Batches run one after another.
+# spring_forces, assembly.update_blocks and NewtonSolver take the batches
+# through a `batches` option; without it they keep the serial bincount scatter.
+# Whether threads pay off depends on NumPy releasing the GIL during the updates;
+# on one core the colored scatter measured 2-6x slower than bincount, and no
+# multi-core speedup has been measured yet.
+
+
+def grid_edge_colors(width, height, structural=True, shear=False, bending=False):
+    """Colors of mesh.grid_edges(...) springs from alternating stripes.
+
+    Every spring family (offset) gets two colors, picked by the parity of the
+    stripe its first node lies in along the offset direction. Neighbouring
+    stripes share nodes; stripes two apart do not. That gives 2 colors per
+    offset: 4 for structural grids, 12 with shear and bending springs.
+    """
+    offsets = []
+    if structural:
+        offsets += [(1, 0), (0, 1)]
+    if shear:
+        offsets += [(1, 1), (-1, 1)]
+    if bending:
+        offsets += [(2, 0), (0, 2)]
+
+    j, i = np.divmod(np.arange(width * height, dtype=np.int64).reshape(height, width), width)
+    colors = []
+    for family, (di, dj) in enumerate(offsets):
+        # Same slicing as mesh._offset_edges, applied to the coordinates of the first node
+        rows = slice(max(0, -dj), height - max(0, dj))
+        cols = slice(max(0, -di), width - max(0, di))
+        # Walk along x when the offset has an x component, otherwise along y
+        stripe = i[rows, cols] // abs(di) if di else j[rows, cols] // abs(dj)
+        colors.append(2 * family + stripe.ravel() % 2)
+    if not colors:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(colors)
+
+
+def greedy_edge_colors(edges, num_nodes, seed=0):
+    """Node-disjoint edge colors for a general graph.
+
+    Each color is grown as a maximal matching in vectorized rounds: every
+    candidate edge draws a random priority and is kept when it beats all other
+    candidates at both of its nodes, then candidates touching kept edges are
+    dropped. Uses at most 2 * max_degree - 1 colors, usually close to max_degree.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    rng = np.random.default_rng(seed)
+    colors = np.full(len(edges), -1, dtype=np.int64)
+    remaining = np.arange(len(edges))
+    color = 0
+    while remaining.size:
+        candidates = remaining
+        while candidates.size:
+            a, b = edges[candidates, 0], edges[candidates, 1]
+            priority = rng.permutation(len(candidates))
+            best = np.full(num_nodes, len(candidates))
+            np.minimum.at(best, a, priority)
+            np.minimum.at(best, b, priority)
+            winners = (best[a] == priority) & (best[b] == priority)
+            colors[candidates[winners]] = color
+
+            touched = np.zeros(num_nodes, dtype=bool)
+            touched[a[winners]] = True
+            touched[b[winners]] = True
+            candidates = candidates[~winners & ~touched[a] & ~touched[b]]
+        remaining = remaining[colors[remaining] < 0]
+        color += 1
+    return colors
+
+
+def color_batches(colors):
+    """Split edge indices into one index array per color, in color order."""
+    colors = np.asarray(colors)
+    order = np.argsort(colors, kind="stable")
+    counts = np.bincount(colors)
+    return [batch for batch in np.split(order, np.cumsum(counts)[:-1]) if batch.size]
+
+
+# Thread pools by worker count, started once and reused by every scatter
+_POOLS = {}
+
+
+def _pool(workers):
+    if workers not in _POOLS:
+        _POOLS[workers] = ThreadPoolExecutor(max_workers=workers)
+    return _POOLS[workers]
+
+
+def scatter_batches(out, targets, values, batches, workers=None):
+    """out[targets[e]] += values[e] for every edge e, one batch at a time.
+
+    `targets` is (E, k) and `values` (E, k, ...). No target may repeat within a
+    batch, which node-disjoint batches guarantee for node slots as well as for
+    the CSR entries of a spring's blocks. Each batch is split into slices for
+    a shared pool of `workers` threads; with one worker everything runs on the
+    caller.
+    """
+    workers = workers or os.cpu_count()
+
+    def scatter(index):
+        out[targets[index]] += values[index]
+
+    if workers == 1:
+        for batch in batches:
+            scatter(batch)
+        return out
+    pool = _pool(workers)
+    for batch in batches:
+        # Slices of one batch never share a target, so they may run concurrently
+        slices = np.array_split(batch, min(workers, max(1, batch.size // 4096)))
+        list(pool.map(scatter, slices))
+    return out
+
+
+def parallel_scatter_add(edges, values, num_nodes, batches, signs=(1.0, -1.0), workers=None, out=None):
+    """Add signs[0] * values[e] to node a and signs[1] * values[e] to node b of every edge.
+
+    `values` is (E, ...), e.g. (E, 3) spring forces with signs (1, -1), and
+    `batches` must be node-disjoint (see color_batches). Hessian blocks go
+    through assembly.update_blocks, which covers the off-diagonal blocks too.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    values = np.asarray(values, dtype=float)
+    if out is None:
+        out = np.zeros((num_nodes,) + values.shape[1:])
+    signed = np.stack([signs[0] * values, signs[1] * values], axis=1)
+    return scatter_batches(out, edges, signed, batches, workers)
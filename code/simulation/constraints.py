@@ -0,0 +1,90 @@
+import numpy as np
+
+# Pinned-node constraints  q = P^T q_hat + b.
+#
+# P selects the free DOFs, so it is never formed as a matrix: it is stored as the
+# index array `free` of free DOFs. Applying P is a gather (q[free]), applying P^T
+# is a scatter into a copy of b, and P A P^T is the free/free block of A.
+#
+# Every solver takes node-level pins, PinConstraints(num_nodes, pinned_nodes),
+# so one object serves all solvers of a mesh. Each solver calls `expand` to get
+# the pins over its own DOF layout: one row per node for ProjectiveDynamicsSolver,
+# dofs_per_node entries per node for the flattened DOF vectors of the others.
+
+
+class PinConstraints:
+    def __init__(self, num_nodes, pinned_nodes, pinned_values=None, dofs_per_node=1):
+        given_nodes = np.asarray(list(pinned_nodes), dtype=np.int64)
+        pinned_nodes, first = np.unique(given_nodes, return_index=True)
+        if pinned_values is not None and len(pinned_nodes) != len(given_nodes):
+            raise ValueError("Pinned nodes must not repeat when pinned_values are given")
+        if len(pinned_nodes) and (pinned_nodes[0] < 0 or pinned_nodes[-1] >= num_nodes):
+            raise ValueError(f"Pinned node indices must lie in [0, {num_nodes})")
+
+        self.num_nodes = num_nodes
+        self.num_dofs = num_nodes * dofs_per_node
+        self.dofs_per_node = dofs_per_node
+        self.pinned_nodes = pinned_nodes
+
+        # Expand node indices to DOF indices
+        is_pinned = np.zeros(num_nodes, dtype=bool)
+        is_pinned[pinned_nodes] = True
+        is_pinned = np.repeat(is_pinned, dofs_per_node)
+        self.pinned = np.flatnonzero(is_pinned)
+        self.free = np.flatnonzero(~is_pinned)
+
+        # b holds the prescribed values on pinned DOFs and zeros elsewhere
+        self.b = np.zeros(self.num_dofs)
+        if pinned_values is not None:
+            # Values follow the caller's node order; reorder them to the sorted pinned nodes
+            values = np.asarray(pinned_values, dtype=float).reshape(len(given_nodes), dofs_per_node)
+            self.b[self.pinned] = values[first].ravel()
+
+    def expand(self, num_dofs, num_nodes=None):
+        """These node-level pins over a system of `num_dofs` DOFs, num_dofs / num_nodes per node.
+
+        Raises ValueError unless the pins are node-level and fit the system
+        (and were built for `num_nodes` nodes, when given). Pinned values only
+        carry over when the layout stays one DOF per node.
+        """
+        if (self.dofs_per_node != 1 or num_dofs % self.num_nodes
+                or (num_nodes is not None and num_nodes != self.num_nodes)):
+            expected = "" if num_nodes is None else f" on {num_nodes} nodes"
+            raise ValueError(f"Expected node-level pins (dofs_per_node=1){expected} for {num_dofs} DOFs, "
+                             f"got pins on {self.num_nodes} nodes with dofs_per_node={self.dofs_per_node}")
+        dofs_per_node = num_dofs // self.num_nodes
+        if dofs_per_node == 1:
+            return self
+        return PinConstraints(self.num_nodes, self.pinned_nodes, dofs_per_node=dofs_per_node)
+
+    @property
+    def num_free(self):
+        return len(self.free)
+
+    def gather(self, q):
+        """q_hat = P q: the free entries of a full vector (works on trailing-DOF batches too)."""
+        return q[..., self.free]
+
+    def scatter(self, q_hat, b=None):
+        """q = P^T q_hat + b: the full vector with pinned entries taken from b."""
+        q_hat = np.asarray(q_hat)
+        q = np.empty(q_hat.shape[:-1] + (self.num_dofs,))
+        q[...] = self.b if b is None else b
+        q[..., self.free] = q_hat
+        return q
+
+    def reduce_matrix(self, A):
+        """P A P^T for a sparse CSR matrix, by slicing out the free/free block."""
+        return A[self.free, :][:, self.free]
+
+    def reduce_system(self, A, rhs, b=None):
+        """Reduce A q = rhs to the free DOFs with the pinned entries fixed to b.
+
+        Returns (P A P^T, P (rhs - A b)).
+        """
+        b = self.b if b is None else b
+        reduced_rhs = rhs[self.free]
+        if len(self.pinned):
+            # Only the free/pinned coupling block of A touches the prescribed values
+            reduced_rhs = reduced_rhs - A[self.free, :][:, self.pinned] @ b[self.pinned]
+        return self.reduce_matrix(A), reduced_rhs
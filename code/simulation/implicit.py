@@ -0,0 +1,73 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# Backward Euler for linear mass-spring meshes, the mesh version of the 1-DOF
+# update in BackwardEulerBase:
+#
+#   (M + dt^2 K) v^{t+1} = M v^t + dt f(q^t),   f(q) = -K (q - q_rest) + f_ext
+#   q^{t+1} = q^t + dt v^{t+1}
+#
+# The system matrix only depends on dt and the mesh, so it is factorized once
+# and every step afterwards is a single pair of sparse triangular solves.
+# With (node-level) PinConstraints the pinned DOFs have zero velocity and only the free/free
+# block of the system is factorized.
+
+
+class BackwardEulerSolver:
+    def __init__(self, stiffness, mass, dt, rest_positions=None, external_forces=None, constraints=None):
+        self.K = sp.csr_matrix(stiffness)
+        self.M = sp.csr_matrix(mass)
+        if self.K.shape != self.M.shape:
+            raise ValueError(f"Stiffness {self.K.shape} and mass {self.M.shape} shapes differ")
+
+        size = self.K.shape[0]
+        self.rest_positions = np.zeros(size) if rest_positions is None else np.asarray(rest_positions, dtype=float)
+        self.external_forces = np.zeros(size) if external_forces is None else np.asarray(external_forces, dtype=float)
+        # Node-level pins, expanded to the DOFs of K
+        self.constraints = None if constraints is None else constraints.expand(size)
+
+        self.dt = None
+        self._factor = None
+        self.factorize(dt)
+
+    def factorize(self, dt, force=False):
+        """(Re)factorize M + dt^2 K; a no-op when dt is unchanged.
+
+        Pass `force=True` after changing K in place, e.g. with assembly.update_stiffness.
+        """
+        if self._factor is not None and dt == self.dt and not force:
+            return
+        system = (self.M + dt**2 * self.K).tocsr()
+        if self.constraints is not None:
+            system = self.constraints.reduce_matrix(system)
+        system = system.tocsc()
+        self._factor = spla.splu(system)
+        self.dt = dt
+
+    def forces(self, q):
+        return -(self.K @ (q - self.rest_positions)) + self.external_forces
+
+    def step(self, q, v, dt=None):
+        """Advance one step, returning (q^{t+1}, v^{t+1})."""
+        if dt is not None:
+            self.factorize(dt)
+        dt = self.dt
+
+        rhs = self.M @ v + dt * self.forces(q)
+        if self.constraints is None:
+            v_new = self._factor.solve(rhs)
+        else:
+            # Pinned DOFs do not move, so their velocity is prescribed to zero
+            v_new = self.constraints.scatter(self._factor.solve(self.constraints.gather(rhs)), b=0.0)
+        q_new = q + dt * v_new
+        return q_new, v_new
+
+    def simulate(self, q0, v0, steps):
+        """Run `steps` steps and return position and velocity arrays of shape (steps + 1, DOFs)."""
+        positions = np.empty((steps + 1, len(q0)))
+        velocities = np.empty((steps + 1, len(v0)))
+        positions[0], velocities[0] = q0, v0
+        for i in range(steps):
+            positions[i + 1], velocities[i + 1] = self.step(positions[i], velocities[i])
+        return positions, velocities
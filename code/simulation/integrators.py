@@ -0,0 +1,297 @@
+import numpy as np
+
+# Batched time integrators for the harmonic oscillator  q'' = -(k/m) q.
+#
+# A state is an (N, 2) array whose rows are (q, v) pairs, so one call advances
+# N independent initial conditions at once. `k_over_m` may be a scalar or an
+# (N,) array of per-oscillator ratios. Every stepper writes the next state into
+# `out`, which lets `integrate` fill a preallocated trajectory tensor.
+#
+# The explicit schemes only ever need the acceleration, so `k_over_m` may also
+# be a callable mapping the position column to accelerations. That runs the
+# same steppers on coupled systems such as spring meshes, where the state rows
+# are DOFs and the callable is  q -> -M^{-1} K (q - q_rest).
+
+
+def acceleration(k_over_m, q):
+    """Acceleration of the positions `q`: -(k/m) q, or k_over_m(q) for a callable."""
+    if callable(k_over_m):
+        return k_over_m(q)
+    return -k_over_m * q
+
+
+def forward_euler_step(state, dt, k_over_m, out):
+    q, v = state[:, 0], state[:, 1]
+    # Both updates use the old state
+    out[:, 1] = v + dt * acceleration(k_over_m, q)
+    out[:, 0] = q + dt * v
+    return out
+
+
+def backward_euler_step(state, dt, k_over_m, out):
+    if callable(k_over_m):
+        raise TypeError("backward_euler_step needs a linear k_over_m; use BackwardEulerSolver for meshes")
+    q, v = state[:, 0], state[:, 1]
+    # Solve (1 + dt^2 * k/m) * v^{t+1} = v^t - dt * (k/m) * q^t
+    #       q^{t+1} = q^t + dt * v^{t+1}
+    out[:, 1] = (v - dt * k_over_m * q) / (1 + dt**2 * k_over_m)
+    out[:, 0] = q + dt * out[:, 1]
+    return out
+
+
+def symplectic_euler_step(state, dt, k_over_m, out):
+    q = state[:, 0]
+    # Explicit velocity step, then position step using the NEW velocity
+    out[:, 1] = state[:, 1] + dt * acceleration(k_over_m, q)
+    out[:, 0] = q + dt * out[:, 1]
+    return out
+
+
+def velocity_verlet_step(state, dt, k_over_m, out):
+    q, v = state[:, 0], state[:, 1]
+    # Kick-drift-kick. The closing kick evaluates the same force as the next
+    # step's opening kick; leapfrog below needs only one evaluation per step
+    a = acceleration(k_over_m, q)
+    half_v = v + 0.5 * dt * a
+    out[:, 0] = q + dt * half_v
+    out[:, 1] = half_v + 0.5 * dt * acceleration(k_over_m, out[:, 0])
+    return out
+
+
+def leapfrog_step(state, dt, k_over_m, out):
+    q, v = state[:, 0], state[:, 1]
+    # Drift-kick-drift: one force evaluation per step at the half-step position
+    half_q = q + 0.5 * dt * v
+    out[:, 1] = v + dt * acceleration(k_over_m, half_q)
+    out[:, 0] = half_q + 0.5 * dt * out[:, 1]
+    return out
+
+
+# Yoshida's triple-jump composition of leapfrog: 4th order and still symplectic
+YOSHIDA_W1 = 1.0 / (2.0 - 2.0 ** (1.0 / 3.0))
+YOSHIDA_W0 = -(2.0 ** (1.0 / 3.0)) * YOSHIDA_W1
+YOSHIDA_DRIFTS = (0.5 * YOSHIDA_W1, 0.5 * (YOSHIDA_W0 + YOSHIDA_W1),
+                  0.5 * (YOSHIDA_W0 + YOSHIDA_W1), 0.5 * YOSHIDA_W1)
+YOSHIDA_KICKS = (YOSHIDA_W1, YOSHIDA_W0, YOSHIDA_W1)
+
+
+def yoshida4_step(state, dt, k_over_m, out):
+    q, v = state[:, 0].copy(), state[:, 1].copy()
+    # Three force evaluations per step
+    for drift, kick in zip(YOSHIDA_DRIFTS, YOSHIDA_KICKS + (None,)):
+        q += drift * dt * v
+        if kick is not None:
+            v += kick * dt * acceleration(k_over_m, q)
+    out[:, 0], out[:, 1] = q, v
+    return out
+
+
+# Dormand-Prince 5(4) tableau
+DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+DP_B5 = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DP_B4 = np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+def make_rk45_stepper(rtol=1e-6, atol=1e-9, max_substeps=10000):
+    """Adaptive Dormand-Prince RK45 stepper behind the fixed-dt interface.
+
+    Each call advances by exactly `dt`, taking as many error-controlled substeps
+    as needed. One substep size is shared by the whole batch and chosen from the
+    worst oscillator's error. The controller's last proposal is remembered so the
+    next call of the same stepper starts from it, which makes the stepper
+    stateful: get_stepper builds a fresh one for every run.
+    """
+    memory = {"h": None}
+
+    def derivative(y, k_over_m):
+        return np.stack([y[:, 1], acceleration(k_over_m, y[:, 0])], axis=1)
+
+    def rk45_step(state, dt, k_over_m, out):
+        y = np.array(state, dtype=float)
+        t, h = 0.0, min(memory["h"] or dt, dt)
+        k = np.empty((7,) + y.shape)
+        k[0] = derivative(y, k_over_m)
+        for _ in range(max_substeps):
+            if t >= dt:
+                break
+            # The final substep is shortened to land on dt; h keeps the unclipped proposal
+            last = h >= dt - t
+            step = dt - t if last else h
+            for stage in range(1, 7):
+                increment = sum(a * k[j] for j, a in enumerate(DP_A[stage]) if a)
+                k[stage] = derivative(y + step * increment, k_over_m)
+            y5 = y + step * np.tensordot(DP_B5, k, axes=1)
+            error = step * np.tensordot(DP_B5 - DP_B4, k, axes=1)
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y5))
+            norm = np.sqrt(np.max(np.mean((error / scale) ** 2, axis=1)))
+
+            if norm <= 1.0:
+                # Accept; the last stage is the first stage of the next substep (FSAL)
+                t = dt if last else t + step
+                y = y5
+                k[0] = k[6]
+                if last:
+                    continue
+            # Standard step-size controller with safety factor and growth limits
+            factor = 10.0 if norm == 0 else min(10.0, max(0.2, 0.9 * norm ** -0.2))
+            h = step * factor
+        else:
+            raise RuntimeError(f"rk45 needed more than {max_substeps} substeps for dt={dt}")
+        memory["h"] = h
+        out[:] = y
+        return out
+
+    return rk45_step
+
+
+STEPPERS = {
+    "forward_euler": forward_euler_step,
+    "backward_euler": backward_euler_step,
+    "symplectic_euler": symplectic_euler_step,
+    "velocity_verlet": velocity_verlet_step,
+    "leapfrog": leapfrog_step,
+    "yoshida4": yoshida4_step,
+}
+
+# Factories of steppers that carry state from call to call; get_stepper builds a
+# fresh one for every run, and one-off callers call the factory themselves
+STATEFUL_STEPPERS = {
+    "rk45": make_rk45_stepper,
+}
+
+# Every integrator name, stateless or not
+METHODS = tuple(STEPPERS) + tuple(STATEFUL_STEPPERS)
+
+
+def get_stepper(method):
+    """Look up a stepper by name, or pass a stepper function straight through.
+
+    Stateful steppers such as rk45 are built fresh on every lookup, so each
+    integrate, advance or IntegrationStream run keeps its own controller.
+    """
+    if callable(method):
+        return method
+    if method in STATEFUL_STEPPERS:
+        return STATEFUL_STEPPERS[method]()
+    try:
+        return STEPPERS[method]
+    except KeyError:
+        raise ValueError(f"Unknown integrator {method!r}, expected one of {sorted(METHODS)}") from None
+
+
+def integrate(initial_states, dt, steps, k_over_m=1.0, method="forward_euler"):
+    """Integrate a batch of (q, v) initial conditions for `steps` steps.
+
+    Returns the full trajectory tensor of shape (steps + 1, N, 2), where
+    trajectory[i] holds the states of all N oscillators at time i * dt.
+    """
+    stepper = get_stepper(method)
+    states = _as_states(initial_states)
+
+    trajectory = np.empty((steps + 1,) + states.shape)
+    trajectory[0] = states
+    for i in range(steps):
+        stepper(trajectory[i], dt, k_over_m, trajectory[i + 1])
+    return trajectory
+
+
+def advance(initial_states, dt, steps, k_over_m=1.0, method="forward_euler"):
+    """Like `integrate`, but only return the final (N, 2) states.
+
+    Two state buffers are swapped every step, so memory stays constant no
+    matter how long the horizon is.
+    """
+    stepper = get_stepper(method)
+    current = _as_states(initial_states).copy()
+    following = np.empty_like(current)
+    for _ in range(steps):
+        stepper(current, dt, k_over_m, following)
+        current, following = following, current
+    return current
+
+
+class IntegrationStream:
+    """Lazy, unbounded iteration over blocks of states.
+
+    Every `next()` integrates `block_steps` more steps and yields them as a fresh
+    (block_steps, N, 2) array: the states at steps + 1 ... steps + block_steps,
+    where `steps` counts the steps taken before the block. Nothing else is kept,
+    so memory does not grow with the horizon. Iteration can stop and continue at
+    any time; `states` and `steps` are all a later run needs to resume, e.g.
+    IntegrationStream(stream.states, dt, ..., start_step=stream.steps).
+    `max_steps` optionally ends the stream, with a shorter final block.
+    """
+
+    def __init__(self, initial_states, dt, k_over_m=1.0, method="forward_euler", block_steps=1024,
+                 start_step=0, max_steps=None):
+        if block_steps <= 0:
+            raise ValueError(f"block_steps must be positive, got {block_steps}")
+        self.stepper = get_stepper(method)
+        self.states = _as_states(initial_states).copy()
+        self.dt = dt
+        self.k_over_m = k_over_m
+        self.block_steps = block_steps
+        self.steps = start_step
+        self.max_steps = max_steps
+
+    @property
+    def time(self):
+        """Time of the current `states`."""
+        return self.steps * self.dt
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        count = self.block_steps
+        if self.max_steps is not None:
+            count = min(count, self.max_steps - self.steps)
+            if count <= 0:
+                raise StopIteration
+        block = np.empty((count,) + self.states.shape)
+        previous = self.states
+        for i in range(count):
+            self.stepper(previous, self.dt, self.k_over_m, block[i])
+            previous = block[i]
+        # Copy, so consumers may modify the yielded block freely
+        self.states = block[-1].copy()
+        self.steps += count
+        return block
+
+
+def harmonic_field(coords, k_over_m=1.0):
+    """Phase-space velocity (dq/dt, dv/dt) = (v, -(k/m) q) at (N, 2) coordinates."""
+    coords = np.asarray(coords, dtype=float)
+    return np.stack([coords[..., 1], -k_over_m * coords[..., 0]], axis=-1)
+
+
+def harmonic_energy(states, k_over_m=1.0):
+    """Energy per unit mass, 1/2 (v^2 + (k/m) q^2), of each (q, v) state."""
+    states = np.asarray(states)
+    return 0.5 * (states[..., 1]**2 + k_over_m * states[..., 0]**2)
+
+
+def _as_states(initial_states):
+    states = np.atleast_2d(np.asarray(initial_states, dtype=float))
+    if states.ndim != 2 or states.shape[1] != 2:
+        raise ValueError(f"Expected initial states of shape (N, 2), got {states.shape}")
+    return states
+
+
+def harmonic_solution(t, q0, v0=0.0, k_over_m=1.0):
+    """Analytic (q, v) of the oscillator at the times `t`, as a (len(t), 2) array."""
+    t = np.asarray(t, dtype=float)
+    omega = np.sqrt(k_over_m)
+    cos, sin = np.cos(omega * t), np.sin(omega * t)
+    q = q0 * cos + v0 / omega * sin
+    v = -q0 * omega * sin + v0 * cos
+    return np.stack([q, v], axis=-1)
@@ -0,0 +1,240 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from assembly import assemble_stiffness, lumped_mass
+from springs import scatter_edge_vectors
+
+# Backward Euler for linear spring meshes with preconditioned conjugate gradients.
+#
+# Same update as implicit.BackwardEulerSolver,
+#
+#   (M + dt^2 K) v^{t+1} = M v^t + dt f(q^t),   q^{t+1} = q^t + dt v^{t+1}
+#
+# but the system is never factorized. Products with K are computed from the
+# spring list with the same gather / scatter-add as the spring kernel, so the
+# only per-DOF storage is a handful of vectors. Each solve starts from v^t, the
+# previous step's solution, which is already close for small dt.
+#
+# Preconditioners:
+#   none       plain CG
+#   jacobi     the diagonal of M + dt^2 K, also computed from the spring list
+#   ichol      incomplete Cholesky  A ~ L D L^T  of the assembled matrix, taken
+#              from the lower factor of a threshold ILU without pivoting
+#   multigrid  geometric V-cycle for grid meshes: bilinear prolongation between
+#              grids of half the resolution, Galerkin coarse operators, damped
+#              Jacobi smoothing and a direct solve on the coarsest grid
+
+
+def spring_matvec(edges, stiffness, x, num_nodes):
+    """K x for the linear spring mesh, without assembling K; x is (N * dofs_per_node,)."""
+    x = np.asarray(x, dtype=float).reshape(num_nodes, -1)
+    stretch = stiffness[:, None] * (x[edges[:, 0]] - x[edges[:, 1]])
+    return scatter_edge_vectors(edges, stretch, num_nodes).ravel()
+
+
+def stiffness_diagonal(edges, stiffness, num_nodes, dofs_per_node=1):
+    """Diagonal of K: the summed stiffness of the springs at every node, per DOF."""
+    node_sum = (np.bincount(edges[:, 0], stiffness, minlength=num_nodes)
+                + np.bincount(edges[:, 1], stiffness, minlength=num_nodes))
+    return np.repeat(node_sum, dofs_per_node)
+
+
+def pcg(matvec, b, x0, precondition, tol=1e-8, maxiter=1000):
+    """Preconditioned CG for SPD systems; returns (x, iterations, converged).
+
+    Stops once ||b - A x|| <= tol * ||b||, or after `maxiter` iterations with
+    `converged` False.
+    """
+    x = np.array(x0, dtype=float)
+    r = b - matvec(x)
+    threshold = tol * np.linalg.norm(b)
+    z = precondition(r)
+    p = z.copy()
+    rz = np.dot(r, z)
+    for iteration in range(maxiter):
+        if np.linalg.norm(r) <= threshold:
+            return x, iteration, True
+        Ap = matvec(p)
+        alpha = rz / np.dot(p, Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        z = precondition(r)
+        rz, rz_old = np.dot(r, z), rz
+        p *= rz / rz_old
+        p += z
+    return x, maxiter, bool(np.linalg.norm(r) <= threshold)
+
+
+def incomplete_cholesky(matrix, drop_tol=1e-3, fill_factor=20):
+    """Preconditioner r -> (L D L^T)^-1 r from an incomplete factorization of an SPD matrix.
+
+    Without pivoting or reordering, spilu's U factor of a symmetric matrix is
+    D L^T up to the dropped entries. Rebuilding the preconditioner from L and D
+    alone keeps it symmetric, which CG needs; the raw L U solve is not.
+    """
+    factor = spla.spilu(sp.csc_matrix(matrix), drop_tol=drop_tol, fill_factor=fill_factor, permc_spec="NATURAL",
+                        diag_pivot_thresh=0.0, options={"SymmetricMode": True})
+    lower = factor.L.tocsr()
+    upper = lower.T.tocsr()
+    diagonal = factor.U.diagonal()
+
+    def precondition(r):
+        y = spla.spsolve_triangular(lower, r, lower=True, unit_diagonal=True)
+        return spla.spsolve_triangular(upper, y / diagonal, lower=False, unit_diagonal=True)
+    return precondition
+
+
+def _linear_prolongation(fine):
+    # 1D interpolation from every other node: fine node 2i is coarse node i and
+    # odd fine nodes average their two neighbours (or copy the last one)
+    coarse = (fine - 1) // 2 + 1
+    rows, cols, values = [np.arange(0, fine, 2)], [np.arange(coarse)], [np.ones(coarse)]
+    odd = np.arange(1, fine, 2)
+    left = odd // 2
+    inside = left + 1 < coarse
+    rows += [odd, odd[inside]]
+    cols += [left, left[inside] + 1]
+    values += [np.where(inside, 0.5, 1.0), np.full(inside.sum(), 0.5)]
+    return sp.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                         shape=(fine, coarse))
+
+
+class GridMultigrid:
+    """Symmetric geometric V-cycle for a matrix on a row-major width x height grid.
+
+    `free` optionally restricts the fine level to the unpinned DOFs, matching a
+    matrix reduced with PinConstraints.reduce_matrix. Coarse DOFs whose whole
+    fine support is pinned are dropped, so every coarse operator stays regular.
+    """
+
+    def __init__(self, matrix, width, height, dofs_per_node=1, free=None, smoothing_steps=2, omega=2 / 3,
+                 coarse_size=64):
+        self.smoothing_steps = smoothing_steps
+        self.omega = omega
+        self.levels = []
+
+        A = sp.csr_matrix(matrix)
+        # Grid DOFs present at the current level; None means all of them
+        kept = free
+        while A.shape[0] > coarse_size and min(width, height) > 2:
+            P = sp.kron(sp.kron(_linear_prolongation(height), _linear_prolongation(width)), sp.eye(dofs_per_node))
+            P = P.tocsr()
+            if kept is not None:
+                P = P[kept]
+            kept = np.flatnonzero(P.getnnz(axis=0))
+            P = P[:, kept].tocsr()
+            self.levels.append((A, 1.0 / A.diagonal(), P))
+            A = (P.T @ A @ P).tocsr()
+            width, height = (width - 1) // 2 + 1, (height - 1) // 2 + 1
+        self._coarse = spla.splu(A.tocsc())
+
+    def __call__(self, r):
+        return self.vcycle(r, 0)
+
+    def vcycle(self, r, level):
+        if level == len(self.levels):
+            return self._coarse.solve(r)
+        A, inverse_diagonal, P = self.levels[level]
+        x = self.omega * inverse_diagonal * r
+        for _ in range(self.smoothing_steps - 1):
+            x += self.omega * inverse_diagonal * (r - A @ x)
+        x += P @ self.vcycle(P.T @ (r - A @ x), level + 1)
+        for _ in range(self.smoothing_steps):
+            x += self.omega * inverse_diagonal * (r - A @ x)
+        return x
+
+
+class ConjugateGradientSolver:
+    PRECONDITIONERS = ("none", "jacobi", "ichol", "multigrid")
+
+    def __init__(self, edges, stiffness, masses, dt, num_nodes, dofs_per_node=1, rest_positions=None,
+                 external_forces=None, constraints=None, preconditioner="jacobi", grid_shape=None,
+                 tol=1e-8, maxiter=1000):
+        if preconditioner not in self.PRECONDITIONERS:
+            raise ValueError(f"Unknown preconditioner {preconditioner!r}; choose from {self.PRECONDITIONERS}")
+        if preconditioner == "multigrid" and grid_shape is None:
+            raise ValueError("The multigrid preconditioner needs grid_shape=(width, height)")
+
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.stiffness = np.broadcast_to(np.asarray(stiffness, dtype=float), (len(self.edges),))
+        self.num_nodes = num_nodes
+        self.dofs_per_node = dofs_per_node
+        size = num_nodes * dofs_per_node
+        self.mass = np.repeat(np.broadcast_to(np.asarray(masses, dtype=float), (num_nodes,)), dofs_per_node)
+        self.rest_positions = np.zeros(size) if rest_positions is None else np.asarray(rest_positions, dtype=float)
+        self.external_forces = np.zeros(size) if external_forces is None else np.asarray(external_forces, dtype=float)
+        # Node-level pins, expanded to dofs_per_node DOFs per node
+        self.constraints = None if constraints is None else constraints.expand(size, num_nodes)
+        self.preconditioner = preconditioner
+        self.grid_shape = grid_shape
+        self.tol = tol
+        self.maxiter = maxiter
+
+        # Iterations of every solve so far, for reports
+        self.iterations = []
+        self.dt = None
+        self._precondition = None
+        self.setup(dt)
+
+    def setup(self, dt):
+        """Build the preconditioner for M + dt^2 K; a no-op when dt is unchanged."""
+        if self._precondition is not None and dt == self.dt:
+            return
+        self.dt = dt
+        if self.preconditioner == "none":
+            self._precondition = lambda r: r
+        elif self.preconditioner == "jacobi":
+            diagonal = self.mass + dt**2 * stiffness_diagonal(self.edges, self.stiffness, self.num_nodes,
+                                                              self.dofs_per_node)
+            inverse = 1.0 / self._free(diagonal)
+            self._precondition = lambda r: inverse * r
+        else:
+            system = (lumped_mass(self.mass, len(self.mass))
+                      + dt**2 * assemble_stiffness(self.edges, self.stiffness, self.num_nodes, self.dofs_per_node))
+            system = system.tocsr()
+            if self.constraints is not None:
+                system = self.constraints.reduce_matrix(system)
+            if self.preconditioner == "ichol":
+                self._precondition = incomplete_cholesky(system)
+            else:
+                free = None if self.constraints is None else self.constraints.free
+                self._precondition = GridMultigrid(system, *self.grid_shape, self.dofs_per_node, free=free)
+
+    def _free(self, x):
+        return x if self.constraints is None else self.constraints.gather(x)
+
+    def matvec(self, x_free):
+        """(M + dt^2 K) restricted to the free DOFs, applied matrix-free."""
+        x = x_free if self.constraints is None else self.constraints.scatter(x_free, b=0.0)
+        result = self.mass * x + self.dt**2 * spring_matvec(self.edges, self.stiffness, x, self.num_nodes)
+        return self._free(result)
+
+    def forces(self, q):
+        return -spring_matvec(self.edges, self.stiffness, q - self.rest_positions, self.num_nodes) + self.external_forces
+
+    def step(self, q, v, dt=None):
+        """Advance one step, returning (q^{t+1}, v^{t+1})."""
+        if dt is not None:
+            self.setup(dt)
+        dt = self.dt
+
+        rhs = self._free(self.mass * v + dt * self.forces(q))
+        v_free, iterations, converged = pcg(self.matvec, rhs, self._free(v), self._precondition, self.tol,
+                                            self.maxiter)
+        self.iterations.append(iterations)
+        if not converged:
+            raise RuntimeError(f"CG did not reach tol={self.tol} within {self.maxiter} iterations "
+                               f"(preconditioner {self.preconditioner!r})")
+        # Pinned DOFs do not move, so their velocity is prescribed to zero
+        v_new = v_free if self.constraints is None else self.constraints.scatter(v_free, b=0.0)
+        return q + dt * v_new, v_new
+
+    def simulate(self, q0, v0, steps):
+        """Run `steps` steps and return position and velocity arrays of shape (steps + 1, DOFs)."""
+        positions = np.empty((steps + 1, len(q0)))
+        velocities = np.empty((steps + 1, len(v0)))
+        positions[0], velocities[0] = q0, v0
+        for i in range(steps):
+            positions[i + 1], velocities[i + 1] = self.step(positions[i], velocities[i])
+        return positions, velocities
@@ -0,0 +1,133 @@
+import numpy as np
+
+# Mass-spring grid topology from vectorized index arithmetic.
+#
+# Nodes of a width x height grid are numbered row-major, node = j * width + i,
+# and sit at (i * spacing, j * spacing, 0). Springs come in three families:
+#   structural  (i, j)-(i+1, j) and (i, j)-(i, j+1)
+#   shear       (i, j)-(i+1, j+1) and (i+1, j)-(i, j+1)
+#   bending     (i, j)-(i+2, j) and (i, j)-(i, j+2)
+# Within a family, horizontal springs come first, each block in row-major order,
+# which matches the order the scenes draw them in.
+
+
+def grid_nodes(width, height, spacing=1.0):
+    """(width * height, 3) node positions of a flat grid in the xy-plane."""
+    nodes = np.zeros((height, width, 3))
+    nodes[:, :, 0] = np.arange(width) * spacing
+    nodes[:, :, 1] = np.arange(height)[:, None] * spacing
+    return nodes.reshape(-1, 3)
+
+
+def _offset_edges(ids, di, dj, out):
+    # Pair every node with the node (di, dj) further along, where it exists,
+    # writing the pairs straight into their block of the edge array
+    height, width = ids.shape
+    start = ids[max(0, -dj):height - max(0, dj), max(0, -di):width - max(0, di)]
+    end = ids[max(0, dj):height - max(0, -dj), max(0, di):width - max(0, -di)]
+    pairs = out.reshape(start.shape + (2,))
+    pairs[..., 0] = start
+    pairs[..., 1] = end
+
+
+def grid_edges(width, height, structural=True, shear=False, bending=False):
+    """(E, 2) spring list of a width x height grid."""
+    ids = np.arange(width * height, dtype=np.int64).reshape(height, width)
+    offsets = _grid_offsets(structural, shear, bending)
+    counts = [max(0, height - abs(dj)) * max(0, width - abs(di)) for di, dj in offsets]
+    edges = np.empty((sum(counts), 2), dtype=np.int64)
+    for (di, dj), start, count in zip(offsets, np.cumsum([0] + counts), counts):
+        _offset_edges(ids, di, dj, edges[start:start + count])
+    return edges
+
+
+def _grid_offsets(structural, shear, bending):
+    offsets = []
+    if structural:
+        offsets += [(1, 0), (0, 1)]
+    if shear:
+        offsets += [(1, 1), (-1, 1)]
+    if bending:
+        offsets += [(2, 0), (0, 2)]
+    return offsets
+
+
+# Above this many increasing runs per endpoint column, adjacency_csr sorts instead
+_MAX_RUNS = 64
+
+
+def adjacency_csr(edges, num_nodes):
+    """CSR node adjacency (indptr, indices) of an undirected edge list.
+
+    The neighbours of node n are indices[indptr[n]:indptr[n + 1]]: first the
+    edges where n is the first endpoint, then those where it is the second, each
+    in edge-list order.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges.ravel(), minlength=num_nodes), out=indptr[1:])
+
+    # Counting sort: every node owns the slots from indptr[n] on, and a per-node
+    # cursor hands them out in order. Within a run of strictly increasing nodes
+    # no node repeats, so a whole run takes its slots in one vectorized step;
+    # grid edge lists are only a dozen such runs
+    indices = np.empty(2 * len(edges), dtype=np.int64)
+    cursor = indptr[:-1].copy()
+    first, second = np.ascontiguousarray(edges.T)
+    for rows, cols in ((first, second), (second, first)):
+        starts = np.flatnonzero(rows[1:] <= rows[:-1]) + 1
+        if len(starts) >= _MAX_RUNS:
+            # Unordered edge lists: rank the entries of each node with a stable sort instead
+            order = np.argsort(rows, kind="stable")
+            ranked = rows[order]
+            rank = np.arange(len(rows)) - np.searchsorted(ranked, ranked)
+            indices[cursor[ranked] + rank] = cols[order]
+            cursor += np.bincount(rows, minlength=num_nodes)
+            continue
+        for start, stop in zip(np.r_[0, starts], np.r_[starts, len(rows)]):
+            run = rows[start:stop]
+            slots = cursor[run]
+            indices[slots] = cols[start:stop]
+            cursor[run] = slots + 1
+    return indptr, indices
+
+
+def grid_adjacency(width, height, structural=True, shear=False, bending=False):
+    """CSR adjacency of a grid, equal to adjacency_csr of its grid_edges.
+
+    No sorting at all: node n's neighbours are n plus each spring offset that
+    stays on the grid, then n minus each. Grid rows whose vertical offsets all
+    stay on the grid (all but the outermost few) share one neighbour pattern
+    shifted by j * width, so each run of such rows is written as a single
+    broadcast into its slice of the preallocated indices.
+    """
+    offsets = np.array(_grid_offsets(structural, shear, bending), dtype=np.int64).reshape(-1, 2)
+    signed = np.concatenate([offsets, -offsets])
+    di, dj = signed[:, 0], signed[:, 1]
+    i, j = np.arange(width)[:, None] + di, np.arange(height)[:, None] + dj
+    i_valid, j_valid = (i >= 0) & (i < width), (j >= 0) & (j < height)
+
+    # Runs of grid rows with the same vertical validity, and their (width, offsets) masks
+    breaks = np.flatnonzero((j_valid[1:] != j_valid[:-1]).any(axis=1)) + 1
+    runs = [(first, last, j_valid[first] & i_valid) for first, last in zip(np.r_[0, breaks], np.r_[breaks, height])]
+
+    counts = np.empty((height, width), dtype=np.int64)
+    for first, last, valid in runs:
+        counts[first:last] = valid.sum(axis=1)
+    indptr = np.zeros(width * height + 1, dtype=np.int64)
+    np.cumsum(counts.ravel(), out=indptr[1:])
+
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    for first, last, valid in runs:
+        # Neighbours of the nodes of grid row 0 under this mask; row j adds j * width
+        pattern = (np.arange(width)[:, None] + di + dj * width)[valid]
+        rows = indices[indptr[first * width]:indptr[last * width]].reshape(last - first, len(pattern))
+        np.add(np.arange(first, last)[:, None] * width, pattern, out=rows)
+    return indptr, indices
+
+
+def grid_mesh(width, height, spacing=1.0, structural=True, shear=False, bending=False):
+    """Nodes, springs and CSR adjacency of a grid: (nodes, edges, (indptr, indices))."""
+    nodes = grid_nodes(width, height, spacing)
+    edges = grid_edges(width, height, structural, shear, bending)
+    return nodes, edges, grid_adjacency(width, height, structural, shear, bending)
@@ -0,0 +1,172 @@
+from manim import *
+import numpy as np
+
+from assembly import sparsity_raster
+from trajectory_store import sample
+
+# Batched helpers that turn NumPy arrays into scene geometry in one shot,
+# instead of calling into manim once per sample.
+#
+# diff-geometry/glyphs.py keeps its own copy of axes_transform,
+# coords_to_points and VectorFieldGlyphs, because each scene directory imports
+# only its own modules; change both together.
+
+
+def axes_transform(axes):
+    """Return (origin, basis) such that points = origin + coords @ basis.
+
+    Only valid for linearly scaled axes, which is what every scene here uses.
+    """
+    origin = np.asarray(axes.coords_to_point(0, 0), dtype=float)
+    basis = np.array([
+        np.asarray(axes.coords_to_point(1, 0), dtype=float) - origin,
+        np.asarray(axes.coords_to_point(0, 1), dtype=float) - origin,
+    ])
+    return origin, basis
+
+
+def coords_to_points(axes, coords):
+    """Map an (N, 2) array of axis coordinates to (N, 3) scene points with one affine transform."""
+    origin, basis = axes_transform(axes)
+    return origin + np.asarray(coords, dtype=float) @ basis
+
+
+def sampled_curve(axes, coords, smooth=True, **kwargs):
+    """VMobject through an (N, 2) array of axis coordinates, e.g. a trajectory."""
+    curve = VMobject(**kwargs)
+    points = coords_to_points(axes, coords)
+    if smooth:
+        curve.set_points_smoothly(points)
+    else:
+        curve.set_points_as_corners(points)
+    return curve
+
+
+class TrajectoryPlayback:
+    """Drive mobjects from a precomputed (steps + 1, ...) trajectory by scene time.
+
+    Playback time lives in a ValueTracker; updaters registered with `drive` look
+    up the interpolated state for the current time, so frames cost an array
+    lookup and never run the integrator. The trajectory can be a memmap from
+    trajectory_store, shared between light and dark renders.
+    """
+
+    def __init__(self, trajectory, dt):
+        self.trajectory = trajectory
+        self.dt = dt
+        self.time = ValueTracker(0.0)
+
+    @property
+    def duration(self):
+        return (len(self.trajectory) - 1) * self.dt
+
+    def state(self):
+        return sample(self.trajectory, self.dt, self.time.get_value())
+
+    def drive(self, mobject, apply):
+        """Call apply(mobject, state) on every frame; returns the mobject."""
+        mobject.add_updater(lambda m: apply(m, self.state()))
+        return mobject
+
+    def play(self, scene, run_time=None, speed=1.0):
+        """Advance playback time over the whole trajectory (or `run_time` seconds)."""
+        run_time = self.duration / speed if run_time is None else run_time
+        scene.play(self.time.animate.set_value(min(run_time * speed, self.duration)),
+                   run_time=run_time, rate_func=linear)
+
+
+class VectorFieldGlyphs(VMobject):
+    """All arrows of a vector field as a single VMobject.
+
+    `starts` and `vectors` are (N, 2) or (N, 3) arrays in scene coordinates. Every
+    glyph contributes one straight shaft and one filled triangular tip as separate
+    subpaths of the same VMobject, so a dense field is one mobject for the
+    renderer instead of thousands of Arrow submobjects. Tips are sized like
+    Arrow's: min(tip_length, max_tip_length_to_length_ratio * length).
+    """
+
+    def __init__(
+        self,
+        starts,
+        vectors,
+        tip_length=DEFAULT_ARROW_TIP_LENGTH,
+        max_tip_length_to_length_ratio=0.25,
+        tip_width_ratio=1.0,
+        color=WHITE,
+        stroke_width=2,
+        stroke_opacity=1.0,
+        fill_opacity=None,
+        **kwargs,
+    ):
+        super().__init__(
+            color=color,
+            stroke_width=stroke_width,
+            stroke_opacity=stroke_opacity,
+            fill_opacity=stroke_opacity if fill_opacity is None else fill_opacity,
+            **kwargs,
+        )
+        self.set_points(self.glyph_points(
+            starts, vectors, tip_length, max_tip_length_to_length_ratio, tip_width_ratio
+        ))
+
+    @staticmethod
+    def glyph_points(starts, vectors, tip_length, max_tip_length_to_length_ratio, tip_width_ratio):
+        starts = _as_points3d(starts)
+        vectors = _as_points3d(vectors)
+        ends = starts + vectors
+
+        length = np.linalg.norm(vectors, axis=1, keepdims=True)
+        direction = np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+        # In-plane perpendicular for the tip's base
+        normal = np.stack([-direction[:, 1], direction[:, 0], np.zeros(len(direction))], axis=1)
+
+        tip = np.minimum(tip_length, max_tip_length_to_length_ratio * length)
+        bases = ends - tip * direction
+        left = bases + 0.5 * tip_width_ratio * tip * normal
+        right = bases - 0.5 * tip_width_ratio * tip * normal
+
+        # Four straight cubic curves per glyph: the shaft, then the closed tip triangle
+        anchors = np.stack([
+            starts, bases,
+            ends, left,
+            left, right,
+            right, ends,
+        ], axis=1).reshape(len(starts), 4, 2, 3)
+        curve_start, curve_end = anchors[:, :, 0], anchors[:, :, 1]
+        curves = np.stack([
+            curve_start,
+            curve_start + (curve_end - curve_start) / 3,
+            curve_start + 2 * (curve_end - curve_start) / 3,
+            curve_end,
+        ], axis=2)
+        return curves.reshape(-1, 3)
+
+
+def _as_points3d(array):
+    array = np.asarray(array, dtype=float)
+    if array.shape[1] == 3:
+        return array
+    return np.column_stack([array, np.zeros(len(array))])
+
+
+class SparsityImage(ImageMobject):
+    """Nonzero pattern of a (possibly huge) sparse matrix as one raster image.
+
+    The pattern is max-pooled down to at most `pixels` per side by
+    assembly.sparsity_raster, so even a 10k+ DOF stiffness matrix is a single
+    mobject of `side_length` scene units.
+    """
+
+    def __init__(self, matrix, side_length=2.5, pixels=512, color=BLACK, background_color=None,
+                 opacity=1.0, **kwargs):
+        pattern = sparsity_raster(matrix, pixels)
+        rgba = np.zeros(pattern.shape + (4,), dtype=np.uint8)
+        if background_color is not None:
+            rgba[:] = (255 * color_to_rgba(background_color, opacity)).astype(np.uint8)
+        rgba[pattern] = (255 * color_to_rgba(color, opacity)).astype(np.uint8)
+
+        super().__init__(rgba, **kwargs)
+        # Keep every matrix entry a crisp square when scaled up
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.stretch_to_fit_width(side_length)
+        self.stretch_to_fit_height(side_length)
@@ -0,0 +1,137 @@
+import numpy as np
+import scipy.sparse.linalg as spla
+
+from assembly import assemble_blocks_slots, lumped_mass, update_blocks
+from springs import rest_lengths, spring_forces
+
+# Backward Euler for nonlinear spring meshes, solved with Newton's method.
+#
+# With y = x^t + h v^t + h^2 M^-1 f_ext, the new positions minimize
+#
+#   g(x) = 1 / (2 h^2) (x - y)^T M (x - y) + V(x)
+#
+# where V is the spring energy of Spring3DBase. Each iteration solves
+#   (M / h^2 + H(x)) dx = -grad g(x),   grad g = M (x - y) / h^2 - f(x)
+# with H assembled from the clamped (positive semi-definite) spring blocks, and
+# backtracks along dx until g decreases enough (Armijo).
+#
+# In quasi-Newton mode the factorization of M / h^2 + H is kept across
+# iterations and time steps. The frozen matrix is still positive definite, so dx
+# stays a descent direction; it is only refactorized when an iteration reduces
+# the gradient by less than `refactor_ratio` or the line search fails.
+#
+# The Hessian's sparsity pattern is built once and only its values are refilled
+# per factorization. With node-disjoint `batches` (coloring.color_batches) the
+# forces and the refill are scattered batch by batch on `workers` threads.
+
+
+class NewtonSolver:
+    def __init__(self, rest_positions, edges, stiffness, masses, dt, constraints=None, external_forces=None,
+                 quasi=False, tol=1e-6, max_iterations=20, refactor_ratio=0.5, batches=None, workers=None):
+        self.rest_positions = np.asarray(rest_positions, dtype=float)
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        num_nodes, dim = self.rest_positions.shape
+
+        self.stiffness = np.broadcast_to(np.asarray(stiffness, dtype=float), (len(self.edges),))
+        self.rest_lengths = rest_lengths(self.rest_positions, self.edges)
+        self.masses = np.broadcast_to(np.asarray(masses, dtype=float), (num_nodes,))
+        self.external_forces = (np.zeros_like(self.rest_positions) if external_forces is None
+                                else np.broadcast_to(np.asarray(external_forces, dtype=float), self.rest_positions.shape))
+        # Node-level pins, expanded to the flattened positions: every coordinate of
+        # a pinned node is pinned, and pinned nodes keep their positions
+        self.constraints = None if constraints is None else constraints.expand(num_nodes * dim, num_nodes)
+        self.dt = dt
+
+        self.quasi = quasi
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.refactor_ratio = refactor_ratio
+        self.batches = batches
+        self.workers = workers
+        self._hessian, self._slots = assemble_blocks_slots(self.edges, num_nodes, dim)
+
+        self._inertia = lumped_mass(self.masses / dt**2, num_nodes, dim)
+        self._factor = None
+        # Running totals, for comparing the full and quasi-Newton modes
+        self.iterations = 0
+        self.factorizations = 0
+
+    def objective(self, x, y):
+        """Return (g(x), spring forces at x) for flattened positions x."""
+        forces, energy, _ = spring_forces(x.reshape(self.rest_positions.shape), self.edges, self.stiffness,
+                                          self.rest_lengths, hessians=False, batches=self.batches,
+                                          workers=self.workers)
+        d = x - y
+        return 0.5 * np.dot(d, self._inertia @ d) + energy, forces.ravel()
+
+    def factorize(self, x):
+        """Factorize M / h^2 + H(x) over the free DOFs."""
+        _, _, blocks = spring_forces(x.reshape(self.rest_positions.shape), self.edges, self.stiffness,
+                                     self.rest_lengths, definite=True)
+        hessian = update_blocks(self._hessian, self._slots, blocks, self.batches, self.workers)
+        system = (self._inertia + hessian).tocsr()
+        if self.constraints is not None:
+            system = self.constraints.reduce_matrix(system)
+        self._factor = spla.splu(system.tocsc())
+        self.factorizations += 1
+
+    def _free(self, array):
+        return array if self.constraints is None else self.constraints.gather(array)
+
+    def step(self, x, v):
+        """Advance one step of length dt; returns (x^{t+1}, v^{t+1}) as (N, 3) arrays."""
+        dt = self.dt
+        x_old = np.asarray(x, dtype=float).ravel()
+        y = x_old + dt * np.asarray(v, dtype=float).ravel() + dt**2 * (self.external_forces / self.masses[:, None]).ravel()
+
+        x_new = y.copy()
+        if self.constraints is not None:
+            x_new[self.constraints.pinned] = x_old[self.constraints.pinned]
+        value, forces = self.objective(x_new, y)
+        grad = self._free(self._inertia @ (x_new - y) - forces)
+        grad_norm0 = grad_norm = np.linalg.norm(grad)
+
+        stale = not self.quasi or self._factor is None
+        for _ in range(self.max_iterations):
+            if grad_norm <= self.tol * max(grad_norm0, 1.0):
+                break
+            if stale:
+                self.factorize(x_new)
+            self.iterations += 1
+
+            if self.constraints is None:
+                dx = -self._factor.solve(grad)
+            else:
+                dx = self.constraints.scatter(-self._factor.solve(grad), b=0.0)
+
+            # Backtracking line search on g
+            slope = np.dot(grad, self._free(dx))
+            alpha = 1.0
+            for _ in range(30):
+                trial = x_new + alpha * dx
+                trial_value, trial_forces = self.objective(trial, y)
+                if trial_value <= value + 1e-4 * alpha * slope:
+                    break
+                alpha *= 0.5
+            else:
+                # No decrease along a stale direction: refresh the Hessian and retry
+                stale = True
+                continue
+
+            x_new, value, forces = trial, trial_value, trial_forces
+            new_grad = self._free(self._inertia @ (x_new - y) - forces)
+            new_norm = np.linalg.norm(new_grad)
+            stale = not self.quasi or new_norm > self.refactor_ratio * grad_norm
+            grad, grad_norm = new_grad, new_norm
+
+        x_new = x_new.reshape(self.rest_positions.shape)
+        return x_new, (x_new - x_old.reshape(x_new.shape)) / dt
+
+    def simulate(self, x0, v0, steps):
+        """Run `steps` steps; returns positions and velocities of shape (steps + 1, N, 3)."""
+        positions = np.empty((steps + 1,) + np.shape(x0))
+        velocities = np.empty_like(positions)
+        positions[0], velocities[0] = x0, v0
+        for i in range(steps):
+            positions[i + 1], velocities[i + 1] = self.step(positions[i], velocities[i])
+        return positions, velocities
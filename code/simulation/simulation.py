@@ -1,7 +1,20 @@
+import os
+
 from manim import *
 import numpy as np
 
+from assembly import assemble_stiffness
+from constraints import PinConstraints
+from integrators import harmonic_field, harmonic_solution, integrate
+from mesh import grid_edges, grid_nodes
+from mobjects import SparsityImage, TrajectoryPlayback, VectorFieldGlyphs, coords_to_points, sampled_curve
+from springs import coil_curve
+from trajectory_store import cached_trajectory
+
 class SpringMassSystemBase(Scene):
+    # Seconds of precomputed oscillation to play after building the system; 0 renders a still
+    playback_duration = 0.0
+
     def __init__(self, theme="light", **kwargs):
         super().__init__(**kwargs)
         self.theme = theme
@@ -32,14 +45,12 @@ class SpringMassSystemBase(Scene):
         # Define spring position offset to center the system
         spring_offset = -spring_length / 2
         
-        def spring_func(t):
-            # t goes from 0 to 1
-            x = spring_offset + t * spring_length  # horizontal stretch with centering
-            y = amplitude * np.sin(num_coils * 2 * PI * t)  # vertical oscillation
-            return np.array([x, y, 0])
+        # Horizontal stretch with centering, vertical oscillation; t goes from 0 to 1
+        spring_start = np.array([spring_offset, 0, 0])
+        spring_end = np.array([spring_offset + spring_length, 0, 0])
         
         spring = ParametricFunction(
-            spring_func,
+            lambda t: coil_curve(t, spring_start, spring_end, amplitude, num_coils),
             t_range=[0, 1, 0.005],  # More points for smoother curve
             stroke_width=4,         # Thick stroke for visibility
             color=self.spring_color
@@ -77,6 +88,34 @@ class SpringMassSystemBase(Scene):
         # Add the scaled group to the scene
         self.add(system_group)
 
+        if self.playback_duration > 0:
+            self.play_oscillation(spring, [mass, mass_label, position_label], origin.get_center(), scale=2)
+
+    def play_oscillation(self, spring, moving, anchor, scale, amplitude=0.4, k_over_m=4.0, dt=1 / 240):
+        # Integrate the whole run up front; updaters only look states up by playback time
+        path = os.path.join(config.media_dir, "trajectories", "spring_mass.npy")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        steps = int(round(self.playback_duration / dt))
+        trajectory = cached_trajectory(path, [[amplitude, 0.0]], dt, steps, k_over_m, method="velocity_verlet")
+        playback = TrajectoryPlayback(trajectory[:, 0], dt)
+
+        rest_points = spring.points.copy()
+        # The spring ends at the center of the mass, the first moving mobject
+        rest_length = moving[0].get_center()[0] - anchor[0]
+
+        def stretch_spring(mob, state):
+            mob.set_points(rest_points.copy())
+            mob.stretch((rest_length + scale * state[0]) / rest_length, 0, about_point=anchor)
+
+        def shift_with_mass(rest_center):
+            return lambda mob, state: mob.move_to(rest_center + scale * state[0] * RIGHT)
+
+        # Updaters only run on mobjects in the scene, so each one is driven directly
+        playback.drive(spring, stretch_spring)
+        for mob in moving:
+            playback.drive(mob, shift_with_mass(mob.get_center()))
+        playback.play(self)
+
 class SpringMassSystem(SpringMassSystemBase):
     """Light theme version (default)"""
     def __init__(self, **kwargs):
@@ -87,6 +126,20 @@ class SpringMassSystemDark(SpringMassSystemBase):
     def __init__(self, **kwargs):
         super().__init__(theme="dark", **kwargs)
 
+class SpringMassOscillation(SpringMassSystemBase):
+    """Animated light theme version"""
+    playback_duration = 8.0
+
+    def __init__(self, **kwargs):
+        super().__init__(theme="light", **kwargs)
+
+class SpringMassOscillationDark(SpringMassSystemBase):
+    """Animated dark theme version"""
+    playback_duration = 8.0
+
+    def __init__(self, **kwargs):
+        super().__init__(theme="dark", **kwargs)
+
 class PhaseSpaceBase(Scene):
     def __init__(self, theme="light", **kwargs):
         super().__init__(**kwargs)
@@ -128,20 +181,18 @@ class PhaseSpaceBase(Scene):
         # Different energy levels create circles of different radii
         radii = [0.6, 1.2, 1.8, 2.4]
         
+        # Parametric circle in phase space: q = r cos(t), v = r sin(t)
+        angles = np.linspace(0, 2*PI, int(round(2*PI / 0.01)) + 1)
+        unit_circle = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        
         for i, radius in enumerate(radii):
-            # Parametric circle in phase space
-            def circle_func(t, r=radius):
-                q = r * np.cos(t)  # position
-                v = r * np.sin(t)  # velocity
-                return axes.coords_to_point(q, v)
-            
             # Make outer circles slightly thicker and more prominent
             stroke_width = 2.5 if i < 2 else 2.0
             alpha = 0.8 if i < 2 else 0.6
             
-            circle = ParametricFunction(
-                circle_func,
-                t_range=[0, 2*PI, 0.01],
+            circle = sampled_curve(
+                axes,
+                radius * unit_circle,
                 stroke_width=stroke_width,
                 color=self.trajectory_color,
                 stroke_opacity=alpha
@@ -149,44 +200,32 @@ class PhaseSpaceBase(Scene):
             trajectories.add(circle)
         
         # Create a dense vector field
-        vector_field = VGroup()
-        
         # Grid of points for vector field
-        for q_val in np.arange(-2.5, 2.6, 0.4):
-            for v_val in np.arange(-2.5, 2.6, 0.4):
-                # Skip points too close to origin to avoid clutter
-                if np.sqrt(q_val**2 + v_val**2) < 0.3:
-                    continue
-                
-                # Vector field for mass-spring: dq/dt = v, dv/dt = -k/m * q
-                # Direction vector is (v, -k/m * q)
-                direction_q = v_val
-                direction_v = -q_val  # assuming k/m = 1
-                
-                # Normalize and scale
-                magnitude = np.sqrt(direction_q**2 + direction_v**2)
-                if magnitude > 0:
-                    direction_q /= magnitude
-                    direction_v /= magnitude
-                
-                # Scale for visibility - smaller arrows for cleaner look
-                scale = 0.15
-                start_point = axes.coords_to_point(q_val, v_val)
-                end_point = axes.coords_to_point(
-                    q_val + scale * direction_q,
-                    v_val + scale * direction_v
-                )
-                
-                # Create arrow with appropriate opacity
-                arrow = Arrow(
-                    start_point,
-                    end_point,
-                    color=self.arrow_color,
-                    stroke_width=2,
-                    max_tip_length_to_length_ratio=0.4,
-                    stroke_opacity=0.7
-                )
-                vector_field.add(arrow)
+        q_grid, v_grid = np.meshgrid(np.arange(-2.5, 2.6, 0.4), np.arange(-2.5, 2.6, 0.4), indexing="ij")
+        grid = np.stack([q_grid.ravel(), v_grid.ravel()], axis=1)
+        
+        # Skip points too close to origin to avoid clutter
+        grid = grid[np.linalg.norm(grid, axis=1) >= 0.3]
+        
+        # Vector field for mass-spring: dq/dt = v, dv/dt = -k/m * q
+        # Direction vector is (v, -k/m * q), assuming k/m = 1
+        directions = harmonic_field(grid, k_over_m=1.0)
+        
+        # Normalize and scale for visibility - smaller arrows for cleaner look
+        scale = 0.15
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        start_points = coords_to_points(axes, grid)
+        end_points = coords_to_points(axes, grid + scale * directions)
+        
+        # All arrows as one glyph mobject with appropriate opacity
+        vector_field = VectorFieldGlyphs(
+            start_points,
+            end_points - start_points,
+            color=self.arrow_color,
+            stroke_width=2,
+            max_tip_length_to_length_ratio=0.4,
+            stroke_opacity=0.7
+        )
         
         # Add a few key trajectory arrows on the circles for clarity
         key_arrows = VGroup()
@@ -292,32 +331,18 @@ class EulerInstabilityBase(Scene):
         # Initial conditions
         q0, v0 = 2.0, 0.0  # Start at maximum displacement
         
-        # True solution (analytical circle)
-        def true_solution_func(t):
-            omega = np.sqrt(k_over_m)
-            q = q0 * np.cos(omega * t)
-            v = -q0 * omega * np.sin(omega * t)
-            return axes.coords_to_point(q, v)
-        
-        true_trajectory = ParametricFunction(
-            true_solution_func,
-            t_range=[0, total_time, 0.01],
+        # True solution (analytical circle), sampled every 0.01 time units
+        t_samples = np.linspace(0, total_time, int(round(total_time / 0.01)) + 1)
+        true_trajectory = sampled_curve(
+            axes,
+            harmonic_solution(t_samples, q0, v0, k_over_m),
             stroke_width=4,
             color=self.true_solution_color
         )
         
         # Forward Euler simulation
-        euler_points = []
-        q_euler, v_euler = q0, v0
-        
-        for i in range(steps + 1):
-            euler_points.append(axes.coords_to_point(q_euler, v_euler))
-            
-            # Forward Euler update
-            v_new = v_euler - dt * k_over_m * q_euler
-            q_new = q_euler + dt * v_euler
-            
-            q_euler, v_euler = q_new, v_new
+        euler_states = integrate([(q0, v0)], dt, steps, k_over_m, method="forward_euler")[:, 0]
+        euler_points = coords_to_points(axes, euler_states)
         
         # Create Euler trajectory as a path through points
         euler_trajectory = VMobject(stroke_width=4, color=self.euler_color)
@@ -417,38 +442,18 @@ class BackwardEulerBase(Scene):
         # Initial conditions
         q0, v0 = 2.0, 0.0  # Start at maximum displacement
         
-        # True solution (analytical circle)
-        def true_solution_func(t):
-            omega = np.sqrt(k_over_m)
-            q = q0 * np.cos(omega * t)
-            v = -q0 * omega * np.sin(omega * t)
-            return axes.coords_to_point(q, v)
-        
-        true_trajectory = ParametricFunction(
-            true_solution_func,
-            t_range=[0, total_time, 0.01],
+        # True solution (analytical circle), sampled every 0.01 time units
+        t_samples = np.linspace(0, total_time, int(round(total_time / 0.01)) + 1)
+        true_trajectory = sampled_curve(
+            axes,
+            harmonic_solution(t_samples, q0, v0, k_over_m),
             stroke_width=4,
             color=self.true_solution_color
         )
         
-        # Backward Euler simulation
-        backward_euler_points = []
-        q_be, v_be = q0, v0
-        
-        for i in range(steps + 1):
-            backward_euler_points.append(axes.coords_to_point(q_be, v_be))
-            
-            # Backward Euler update: solve (I - dt^2 K) v^{t+1} = M v^t + dt f(q^t)
-            # For our system: v^{t+1} + dt^2 * (k/m) * q^{t+1} = v^t
-            #                 q^{t+1} - dt * v^{t+1} = q^t
-            # This gives us: (1 + dt^2 * k/m) * v^{t+1} = v^t - dt * (k/m) * q^t
-            #                q^{t+1} = q^t + dt * v^{t+1}
-            
-            denominator = 1 + dt**2 * k_over_m
-            v_new = (v_be - dt * k_over_m * q_be) / denominator
-            q_new = q_be + dt * v_new
-            
-            q_be, v_be = q_new, v_new
+        # Backward Euler simulation: solve (I - dt^2 K) v^{t+1} = M v^t + dt f(q^t)
+        backward_euler_states = integrate([(q0, v0)], dt, steps, k_over_m, method="backward_euler")[:, 0]
+        backward_euler_points = coords_to_points(axes, backward_euler_states)
         
         # Create Backward Euler trajectory as a path through points
         backward_euler_trajectory = VMobject(stroke_width=4, color=self.backward_euler_color)
@@ -555,34 +560,18 @@ class SymplecticEulerBase(Scene):
         # Initial conditions
         q0, v0 = 2.0, 0.0  # Start at maximum displacement
         
-        # True solution (analytical circle)
-        def true_solution_func(t):
-            omega = np.sqrt(k_over_m)
-            q = q0 * np.cos(omega * t)
-            v = -q0 * omega * np.sin(omega * t)
-            return axes.coords_to_point(q, v)
-        
-        true_trajectory = ParametricFunction(
-            true_solution_func,
-            t_range=[0, total_time, 0.01],
+        # True solution (analytical circle), sampled every 0.01 time units
+        t_samples = np.linspace(0, total_time, int(round(total_time / 0.01)) + 1)
+        true_trajectory = sampled_curve(
+            axes,
+            harmonic_solution(t_samples, q0, v0, k_over_m),
             stroke_width=4,
             color=self.true_solution_color
         )
         
-        # Symplectic Euler simulation
-        symplectic_points = []
-        q_se, v_se = q0, v0
-        
-        for i in range(steps + 1):
-            symplectic_points.append(axes.coords_to_point(q_se, v_se))
-            
-            # Symplectic Euler update:
-            # 1. First take an explicit velocity step
-            v_new = v_se - dt * k_over_m * q_se
-            # 2. Next take an implicit position step using the NEW velocity
-            q_new = q_se + dt * v_new
-            
-            q_se, v_se = q_new, v_new
+        # Symplectic Euler simulation: explicit velocity step, then position step with the NEW velocity
+        symplectic_states = integrate([(q0, v0)], dt, steps, k_over_m, method="symplectic_euler")[:, 0]
+        symplectic_points = coords_to_points(axes, symplectic_states)
         
         # Create Symplectic Euler trajectory as a path through points
         symplectic_trajectory = VMobject(stroke_width=4, color=self.symplectic_color)
@@ -678,61 +667,36 @@ class MatrixAssemblyBase(Scene):
         # Position the mesh on the left side
         mesh_center = LEFT * 4
         
-        # Create nodes
+        # Create nodes, numbered row-major from the bottom-left
         nodes = VGroup()
-        node_positions = {}
-        
-        for j in range(mesh_height):
-            for i in range(mesh_width):
-                node_idx = j * mesh_width + i
-                pos = mesh_center + RIGHT * (i * node_spacing) + UP * (j * node_spacing - 0.5)
-                node = Circle(
-                    radius=0.15,
-                    fill_color=self.node_color,
-                    fill_opacity=0.8,
-                    stroke_color=self.node_color,
-                    stroke_width=2
-                ).move_to(pos)
-                
-                # Add node index label
-                label = MathTex(str(node_idx), font_size=24, color=self.label_color).move_to(pos)
-                
-                nodes.add(VGroup(node, label))
-                node_positions[node_idx] = pos
+        node_positions = mesh_center + DOWN * 0.5 + grid_nodes(mesh_width, mesh_height, node_spacing)
+        
+        for node_idx, pos in enumerate(node_positions):
+            node = Circle(
+                radius=0.15,
+                fill_color=self.node_color,
+                fill_opacity=0.8,
+                stroke_color=self.node_color,
+                stroke_width=2
+            ).move_to(pos)
+            
+            # Add node index label
+            label = MathTex(str(node_idx), font_size=24, color=self.label_color).move_to(pos)
+            
+            nodes.add(VGroup(node, label))
         
-        # Create springs (edges)
+        # Create springs (edges): horizontal springs first, then vertical ones
         springs = VGroup()
-        spring_data = []  # Store spring connectivity
-        
-        # Horizontal springs
-        for j in range(mesh_height):
-            for i in range(mesh_width - 1):
-                node1 = j * mesh_width + i
-                node2 = j * mesh_width + (i + 1)
-                
-                spring = Line(
-                    node_positions[node1],
-                    node_positions[node2],
-                    stroke_width=3,
-                    color=self.spring_color
-                )
-                springs.add(spring)
-                spring_data.append((node1, node2))
-        
-        # Vertical springs
-        for j in range(mesh_height - 1):
-            for i in range(mesh_width):
-                node1 = j * mesh_width + i
-                node2 = (j + 1) * mesh_width + i
-                
-                spring = Line(
-                    node_positions[node1],
-                    node_positions[node2],
-                    stroke_width=3,
-                    color=self.spring_color
-                )
-                springs.add(spring)
-                spring_data.append((node1, node2))
+        spring_data = grid_edges(mesh_width, mesh_height)  # Store spring connectivity
+        
+        for node1, node2 in spring_data:
+            spring = Line(
+                node_positions[node1],
+                node_positions[node2],
+                stroke_width=3,
+                color=self.spring_color
+            )
+            springs.add(spring)
         
         # Highlight one specific spring for demonstration
         highlight_spring_idx = 2  # Choose a horizontal spring
@@ -757,26 +721,14 @@ class MatrixAssemblyBase(Scene):
             fill_opacity=0
         ).move_to(matrix_center)
         
-        # Create matrix grid
-        matrix_grid = VGroup()
-        for i in range(total_dofs + 1):
-            # Vertical lines
-            line = Line(
-                matrix_center + LEFT * matrix_size/2 + RIGHT * i * cell_size,
-                matrix_center + LEFT * matrix_size/2 + RIGHT * i * cell_size + UP * matrix_size,
-                stroke_width=0.5,
-                color=self.matrix_color
-            )
-            matrix_grid.add(line)
-            
-            # Horizontal lines
-            line = Line(
-                matrix_center + DOWN * matrix_size/2 + UP * i * cell_size,
-                matrix_center + DOWN * matrix_size/2 + UP * i * cell_size + RIGHT * matrix_size,
-                stroke_width=0.5,
-                color=self.matrix_color
-            )
-            matrix_grid.add(line)
+        # Nonzero pattern of the assembled global stiffness matrix as a single raster
+        K = assemble_stiffness(spring_data, 1.0, num_nodes=total_dofs)
+        matrix_pattern = SparsityImage(
+            K,
+            side_length=matrix_size,
+            color=self.matrix_color,
+            opacity=0.35
+        ).move_to(matrix_center)
         
         # Highlight the contribution from the selected spring
         spring_nodes = spring_data[highlight_spring_idx]
@@ -785,9 +737,10 @@ class MatrixAssemblyBase(Scene):
         # Create highlighted matrix entries for this spring's contribution
         highlighted_entries = VGroup()
         
-        # The spring connects nodes node1 and node2, so it contributes to:
+        # The spring connects nodes node1 and node2, so E_j^T K_j E_j is nonzero at:
         # K[node1,node1], K[node1,node2], K[node2,node1], K[node2,node2]
-        positions = [(node1, node1), (node1, node2), (node2, node1), (node2, node2)]
+        spring_contribution = assemble_stiffness([spring_nodes], 1.0, num_nodes=total_dofs)
+        positions = zip(*spring_contribution.nonzero())
         
         for i, j in positions:
             # Calculate position in matrix
@@ -837,10 +790,10 @@ class MatrixAssemblyBase(Scene):
             stroke_width=3
         )
         
-        # Group everything
-        assembly_diagram = VGroup(
+        # Group everything; Group rather than VGroup because the pattern is an ImageMobject
+        assembly_diagram = Group(
             nodes, springs, highlighted_spring,
-            matrix_bg, matrix_grid, highlighted_entries,
+            matrix_bg, matrix_pattern, highlighted_entries,
             mesh_label, matrix_label, formula, spring_label, arrow
         )
         
@@ -897,26 +850,9 @@ class Spring3DBase(Scene):
         mass_1_highlight = Circle(radius=0.25, fill_color=WHITE, fill_opacity=0.3, stroke_width=0)
         mass_1_highlight.move_to(pos_1 + UP * 0.1 + LEFT * 0.1)
         
-        # Create spring as a zigzag pattern
-        def spring_func(t):
-            # Linear interpolation along the spring
-            center_line = pos_0 + t * (pos_1 - pos_0)
-            
-            # Add zigzag pattern
-            spring_direction = pos_1 - pos_0
-            spring_length = np.linalg.norm(spring_direction)
-            perpendicular = np.array([-spring_direction[1], spring_direction[0], 0])
-            perpendicular = perpendicular / np.linalg.norm(perpendicular) if np.linalg.norm(perpendicular) > 0 else np.array([0, 1, 0])
-            
-            # Zigzag amplitude and frequency
-            amplitude = 0.3
-            frequency = 12
-            
-            zigzag_offset = amplitude * np.sin(2 * PI * frequency * t) * perpendicular
-            return center_line + zigzag_offset
-        
+        # Create spring as a zigzag pattern with amplitude 0.3 and frequency 12
         spring = ParametricFunction(
-            spring_func,
+            lambda t: coil_curve(t, pos_0, pos_1, 0.3, 12),
             t_range=[0.1, 0.9, 0.005],
             stroke_width=5,
             color=self.spring_color
@@ -1067,82 +1003,55 @@ class ConstraintsBase(Scene):
         # Define which nodes are pinned (fixed) - top corners and middle top
         pinned_nodes = {0, 3, 6}  # Top-left, top-right, and one middle top node
         
-        # Create nodes
+        # Create nodes, numbered row-major from the top-left: center the grid and flip it vertically
         nodes = VGroup()
-        node_positions = {}
-        
-        for j in range(mesh_height):
-            for i in range(mesh_width):
-                node_idx = j * mesh_width + i
-                pos = (
-                    mesh_center + 
-                    RIGHT * (i * node_spacing - (mesh_width - 1) * node_spacing / 2) + 
-                    UP * ((mesh_height - 1 - j) * node_spacing - (mesh_height - 1) * node_spacing / 2)
+        grid = grid_nodes(mesh_width, mesh_height, node_spacing)
+        node_positions = mesh_center + (grid - grid.mean(axis=0)) * np.array([1, -1, 1])
+        
+        for node_idx, pos in enumerate(node_positions):
+            # Choose color based on whether node is pinned
+            if node_idx in pinned_nodes:
+                node_color = self.pinned_node_color
+                node = Circle(
+                    radius=0.15,
+                    fill_color=node_color,
+                    fill_opacity=0.9,
+                    stroke_color=node_color,
+                    stroke_width=4
+                )
+                # Add pin symbol
+                pin = Rectangle(width=0.1, height=0.3, fill_color=node_color, fill_opacity=1, stroke_width=0)
+                pin.move_to(pos)
+                node.move_to(pos)
+                node_group = VGroup(node, pin)
+            else:
+                node_color = self.free_node_color
+                node = Circle(
+                    radius=0.12,
+                    fill_color=node_color,
+                    fill_opacity=0.8,
+                    stroke_color=node_color,
+                    stroke_width=3
                 )
-                
-                # Choose color based on whether node is pinned
-                if node_idx in pinned_nodes:
-                    node_color = self.pinned_node_color
-                    node = Circle(
-                        radius=0.15,
-                        fill_color=node_color,
-                        fill_opacity=0.9,
-                        stroke_color=node_color,
-                        stroke_width=4
-                    )
-                    # Add pin symbol
-                    pin = Rectangle(width=0.1, height=0.3, fill_color=node_color, fill_opacity=1, stroke_width=0)
-                    pin.move_to(pos)
-                    node.move_to(pos)
-                    node_group = VGroup(node, pin)
-                else:
-                    node_color = self.free_node_color
-                    node = Circle(
-                        radius=0.12,
-                        fill_color=node_color,
-                        fill_opacity=0.8,
-                        stroke_color=node_color,
-                        stroke_width=3
-                    )
-                    node.move_to(pos)
-                    node_group = node
-                
-                # Add node index label
-                label = MathTex(str(node_idx), font_size=18, color=self.label_color).move_to(pos)
-                
-                nodes.add(VGroup(node_group, label))
-                node_positions[node_idx] = pos
+                node.move_to(pos)
+                node_group = node
+            
+            # Add node index label
+            label = MathTex(str(node_idx), font_size=18, color=self.label_color).move_to(pos)
+            
+            nodes.add(VGroup(node_group, label))
         
         # Create springs (edges)
         springs = VGroup()
         
-        # Horizontal springs
-        for j in range(mesh_height):
-            for i in range(mesh_width - 1):
-                node1 = j * mesh_width + i
-                node2 = j * mesh_width + (i + 1)
-                
-                spring = Line(
-                    node_positions[node1],
-                    node_positions[node2],
-                    stroke_width=2,
-                    color=self.spring_color
-                )
-                springs.add(spring)
-        
-        # Vertical springs
-        for j in range(mesh_height - 1):
-            for i in range(mesh_width):
-                node1 = j * mesh_width + i
-                node2 = (j + 1) * mesh_width + i
-                
-                spring = Line(
-                    node_positions[node1],
-                    node_positions[node2],
-                    stroke_width=2,
-                    color=self.spring_color
-                )
-                springs.add(spring)
+        for node1, node2 in grid_edges(mesh_width, mesh_height):
+            spring = Line(
+                node_positions[node1],
+                node_positions[node2],
+                stroke_width=2,
+                color=self.spring_color
+            )
+            springs.add(spring)
         
         # Add legend
         legend_pinned = VGroup(
@@ -1171,7 +1080,7 @@ class ConstraintsBase(Scene):
         
         # Add DOF reduction illustration
         total_nodes = mesh_width * mesh_height
-        free_nodes = total_nodes - len(pinned_nodes)
+        free_nodes = PinConstraints(total_nodes, pinned_nodes).num_free
         
         dof_info = VGroup(
             MathTex(f"\\text{{Total nodes: }}{total_nodes}", font_size=24, color=self.label_color),
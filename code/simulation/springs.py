@@ -0,0 +1,96 @@
+import numpy as np
+
+from coloring import parallel_scatter_add
+
+# Vectorized kernel for 3D (nonlinear) springs, as in Spring3DBase:
+#
+#   V   = 1/2 k (l - l0)^2,          l = ||x_i - x_j||
+#   f_i = -k (l - l0) / l (x_i - x_j),   f_j = -f_i
+#
+# With u = (x_i - x_j) / l, the Hessian block of V with respect to x_i is
+#
+#   H = k [ u u^T + (1 - l0 / l) (I - u u^T) ]
+#
+# and the spring contributes [[H, -H], [-H, H]] to the global Hessian.
+# Positions are (N, 3) arrays and edges (E, 2) integer arrays.
+
+
+def rest_lengths(positions, edges):
+    """Spring lengths in the given configuration, for use as rest lengths."""
+    edges = np.asarray(edges)
+    return np.linalg.norm(positions[edges[:, 0]] - positions[edges[:, 1]], axis=1)
+
+
+def scatter_edge_vectors(edges, edge_vectors, num_nodes):
+    """Add +vector to the first node and -vector to the second node of every edge."""
+    edges = np.asarray(edges)
+    dim = edge_vectors.shape[1]
+    result = np.empty((num_nodes, dim))
+    # bincount is a much faster scatter-add than np.add.at
+    for c in range(dim):
+        result[:, c] = (np.bincount(edges[:, 0], edge_vectors[:, c], minlength=num_nodes)
+                        - np.bincount(edges[:, 1], edge_vectors[:, c], minlength=num_nodes))
+    return result
+
+
+def spring_forces(positions, edges, stiffness, rest_length, hessians=True, definite=False, batches=None,
+                  workers=None):
+    """Evaluate all springs of a mesh in one vectorized pass.
+
+    Returns (forces, energy, blocks): the (N, 3) net force on every node, the
+    total potential energy and the (E, 3, 3) per-spring Hessian blocks (None when
+    `hessians` is False). With `definite=True` the (1 - l0 / l) factor is clamped
+    at zero so compressed springs yield positive semi-definite blocks, which
+    keeps Newton and implicit solves well posed. Node-disjoint `batches` (see
+    coloring.color_batches) scatter the forces on `workers` threads.
+    """
+    positions = np.asarray(positions, dtype=float)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    stiffness = np.broadcast_to(np.asarray(stiffness, dtype=float), (len(edges),))
+    rest_length = np.broadcast_to(np.asarray(rest_length, dtype=float), (len(edges),))
+
+    d = positions[edges[:, 0]] - positions[edges[:, 1]]
+    length = np.sqrt(np.einsum("ij,ij->i", d, d))
+    # Guard coincident endpoints; their direction is arbitrary anyway
+    safe_length = np.where(length > 0, length, 1.0)
+
+    stretch = length - rest_length
+    energy = 0.5 * np.dot(stiffness, stretch**2)
+
+    # Force on the first endpoint of each spring; the second gets the negative
+    edge_forces = -(stiffness * stretch / safe_length)[:, None] * d
+    if batches is None:
+        forces = scatter_edge_vectors(edges, edge_forces, len(positions))
+    else:
+        forces = parallel_scatter_add(edges, edge_forces, len(positions), batches, workers=workers)
+
+    blocks = None
+    if hessians:
+        u = d / safe_length[:, None]
+        uu = u[:, :, None] * u[:, None, :]
+        tangent = 1.0 - rest_length / safe_length
+        if definite:
+            tangent = np.maximum(tangent, 0.0)
+        dim = positions.shape[1]
+        blocks = tangent[:, None, None] * (np.eye(dim) - uu) + uu
+        blocks *= stiffness[:, None, None]
+
+    return forces, energy, blocks
+
+
+def coil_curve(t, start, end, amplitude, turns):
+    """Points of a drawn coil spring between `start` and `end`, t in [0, 1].
+
+    The coil is a sine wave of `turns` periods and the given amplitude,
+    perpendicular to the spring axis in the xy-plane. diff-geometry/curves.py
+    keeps its own copy for its scenes; change both together.
+    """
+    t = np.asarray(t, dtype=float)[..., None]
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    axis = end - start
+    perpendicular = np.array([-axis[1], axis[0], 0.0])
+    norm = np.linalg.norm(perpendicular)
+    perpendicular = perpendicular / norm if norm > 0 else np.array([0.0, 1.0, 0.0])
+    points = start + t * axis + amplitude * np.sin(2 * np.pi * turns * t) * perpendicular
+    return points
+
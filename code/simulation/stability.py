@@ -0,0 +1,144 @@
+import numpy as np
+
+from integrators import DP_A, DP_B5, METHODS, YOSHIDA_DRIFTS, YOSHIDA_KICKS
+
+# Linear stability maps of the integrators over complex z = lambda * dt.
+#
+# Every stepper in integrators.py is a linear map on (q, v) when applied to a
+# linear oscillator, so one step is a 2 x 2 amplification matrix G and the
+# scheme is stable when the spectral radius of G is at most 1. The oscillator
+# whose eigenvalues are z and conj(z) is
+#
+#   q'' = -k q - c q',   k = |z|^2,   c = -2 Re(z)       (with dt = 1)
+#
+# so the imaginary axis is the undamped oscillator of the Euler scenes, and for
+# Runge-Kutta methods the map reduces to the classic |R(z)| <= 1 region. Each
+# scheme below repeats the stepper's formulas with the velocity-dependent
+# force evaluated at the latest velocity available (as in OscillatorBatch),
+# which matches integrators.py exactly wherever c = 0. The two columns of G
+# are the images of (1, 0) and (0, 1), computed for every grid point at once.
+
+
+def _forward_euler(q, v, accel):
+    return q + v, v + accel(q, v)
+
+
+def _backward_euler(q, v, accel):
+    # a is linear, so accel(q, 0) = -k q and accel(0, 1) = -c; solve the 1-unknown system
+    k, c = -accel(1.0, 0.0), -accel(0.0, 1.0)
+    v_new = (v - k * q) / (1 + c + k)
+    return q + v_new, v_new
+
+
+def _symplectic_euler(q, v, accel):
+    v_new = v + accel(q, v)
+    return q + v_new, v_new
+
+
+def _velocity_verlet(q, v, accel):
+    half_v = v + 0.5 * accel(q, v)
+    q_new = q + half_v
+    return q_new, half_v + 0.5 * accel(q_new, half_v)
+
+
+def _leapfrog(q, v, accel):
+    half_q = q + 0.5 * v
+    v_new = v + accel(half_q, v)
+    return half_q + 0.5 * v_new, v_new
+
+
+def _yoshida4(q, v, accel):
+    for drift, kick in zip(YOSHIDA_DRIFTS, YOSHIDA_KICKS + (None,)):
+        q = q + drift * v
+        if kick is not None:
+            v = v + kick * accel(q, v)
+    return q, v
+
+
+def _rk45(q, v, accel):
+    # One fixed Dormand-Prince step: the controller is not part of the linear map
+    stages = []
+    for row in DP_A[:6]:
+        stage_q = q + sum(a * s[0] for a, s in zip(row, stages) if a)
+        stage_v = v + sum(a * s[1] for a, s in zip(row, stages) if a)
+        stages.append((stage_v, accel(stage_q, stage_v)))
+    return (q + sum(b * s[0] for b, s in zip(DP_B5, stages) if b),
+            v + sum(b * s[1] for b, s in zip(DP_B5, stages) if b))
+
+
+SCHEMES = {
+    "forward_euler": _forward_euler,
+    "backward_euler": _backward_euler,
+    "symplectic_euler": _symplectic_euler,
+    "velocity_verlet": _velocity_verlet,
+    "leapfrog": _leapfrog,
+    "yoshida4": _yoshida4,
+    "rk45": _rk45,
+}
+# Every integrator needs a scheme; checked explicitly so it also holds under python -O
+if SCHEMES.keys() != set(METHODS):
+    raise RuntimeError(f"Stability schemes {sorted(SCHEMES)} do not match the integrators {sorted(METHODS)}")
+
+
+def amplification_matrices(method, z):
+    """(..., 2, 2) one-step matrices G with (q, v)^{t+1} = G (q, v)^t at every z = lambda * dt."""
+    z = np.asarray(z, dtype=complex)
+    k = np.abs(z)**2
+    c = -2.0 * z.real
+
+    def accel(q, v):
+        return -k * q - c * v
+
+    try:
+        scheme = SCHEMES[method]
+    except KeyError:
+        raise ValueError(f"Unknown integrator {method!r}, expected one of {sorted(SCHEMES)}") from None
+    # Both basis states in one pass: the leading axis holds (1, 0) and (0, 1)
+    basis_q = np.array([1.0, 0.0]).reshape((2,) + (1,) * z.ndim)
+    basis_v = np.array([0.0, 1.0]).reshape((2,) + (1,) * z.ndim)
+    q, v = scheme(np.broadcast_to(basis_q, (2,) + z.shape), np.broadcast_to(basis_v, (2,) + z.shape), accel)
+    # Column j of G is the image of basis state j
+    return np.stack([np.moveaxis(q, 0, -1), np.moveaxis(v, 0, -1)], axis=-2)
+
+
+def spectral_radius(method, z, chunk_size=1 << 20):
+    """Spectral radius of the amplification matrix at every z, in chunks of `chunk_size` points."""
+    z = np.asarray(z, dtype=complex)
+    flat = z.ravel()
+    radius = np.empty(flat.shape)
+    for start in range(0, len(flat), chunk_size):
+        G = amplification_matrices(method, flat[start:start + chunk_size])
+        # Eigenvalues of a 2 x 2 matrix from its trace and determinant
+        half_trace = 0.5 * (G[:, 0, 0] + G[:, 1, 1])
+        det = G[:, 0, 0] * G[:, 1, 1] - G[:, 0, 1] * G[:, 1, 0]
+        root = np.sqrt((half_trace**2 - det).astype(complex))
+        radius[start:start + chunk_size] = np.maximum(np.abs(half_trace + root), np.abs(half_trace - root))
+    return radius.reshape(z.shape)
+
+
+def complex_grid(real_range=(-4.0, 1.0), imag_range=(-4.0, 4.0), resolution=1024):
+    """(resolution, resolution) grid of z values, imaginary part increasing down the rows."""
+    real = np.linspace(*real_range, resolution)
+    imag = np.linspace(*imag_range, resolution)
+    return real[None, :] + 1j * imag[:, None]
+
+
+def stability_maps(z, methods=None):
+    """Spectral-radius field of every method (default: all integrators) over the z grid."""
+    methods = list(SCHEMES) if methods is None else methods
+    return {method: spectral_radius(method, z) for method in methods}
+
+
+def stable_dt(method, eigenvalues, dt_max=10.0, samples=100000, tol=1e-9):
+    """Largest dt <= dt_max keeping every lambda * dt stable, from a dense scan of dt.
+
+    `eigenvalues` are the system's lambdas, e.g. 1j * omega for an undamped
+    oscillator. Returns 0.0 when even the smallest sampled dt is unstable.
+    """
+    eigenvalues = np.atleast_1d(np.asarray(eigenvalues, dtype=complex))
+    dts = np.linspace(0.0, dt_max, samples + 1)[1:]
+    radius = spectral_radius(method, dts[:, None] * eigenvalues[None, :]).max(axis=1)
+    unstable = np.flatnonzero(radius > 1.0 + tol)
+    if len(unstable) == 0:
+        return dt_max
+    return dts[unstable[0] - 1] if unstable[0] > 0 else 0.0
@@ -0,0 +1,141 @@
+import argparse
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from integrators import get_stepper, harmonic_energy
+
+# Stability sweeps of the Euler schemes over a grid of (dt, k/m, q0, v0).
+#
+# Every grid point is simulated up to `total_time` and summarized by
+#   growth factor  (E_T / E_0) ** (1 / (2 n)), the mean per-step amplitude growth
+#   blow-up time   first time the energy exceeds `blowup_ratio * E_0` (inf if never)
+# The flattened grid is split into chunks that are integrated as one batch each
+# on a process pool, and results are written to a memory-mapped .npy file as
+# chunks finish, so nothing larger than a chunk is ever held in memory.
+#
+# Usage: python sweep.py stability.npy --dt 0.01:0.5:64 --k-over-m 0.5:4:64 --q0 1 2
+
+EULER_METHODS = ("forward_euler", "backward_euler", "symplectic_euler")
+GROWTH, BLOWUP_TIME = 0, 1
+
+
+def run_chunk(params, methods, total_time, blowup_ratio):
+    """Integrate a (P, 4) chunk of (dt, k/m, q0, v0) rows; returns (P, methods, 2)."""
+    dt, k_over_m = params[:, 0], params[:, 1]
+    initial = params[:, 2:4]
+    energy0 = harmonic_energy(initial, k_over_m)
+    steps = np.ceil(total_time / dt).astype(np.int64)
+
+    result = np.empty((len(params), len(methods), 2))
+    for m, method in enumerate(methods):
+        stepper = get_stepper(method)
+        state, following = initial.copy(), np.empty_like(initial)
+        blowup_step = np.full(len(params), -1)
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            for i in range(1, steps.max() + 1):
+                stepper(state, dt, k_over_m, following)
+                # Rows that reached their own horizon keep their final state
+                active = i <= steps
+                state[active] = following[active]
+
+                energy = harmonic_energy(state, k_over_m)
+                new_blowups = active & (blowup_step < 0) & ~(energy <= blowup_ratio * energy0)
+                blowup_step[new_blowups] = i
+
+            final_energy = harmonic_energy(state, k_over_m)
+            result[:, m, GROWTH] = (final_energy / energy0) ** (1 / (2 * steps))
+        result[:, m, BLOWUP_TIME] = np.where(blowup_step >= 0, blowup_step * dt, np.inf)
+    return result
+
+
+def sweep(path, dt_values, k_over_m_values, q0_values, v0_values, methods=EULER_METHODS,
+          total_time=20.0, blowup_ratio=100.0, chunk_size=4096, workers=None):
+    """Run the sweep and stream it to `path`.
+
+    Returns a read-only memmap of shape (len(dt), len(k/m), len(q0), len(v0),
+    len(methods), 2), where the last axis holds [growth factor, blow-up time].
+    The axis values are saved next to it as `<path>.axes.npz`.
+    """
+    axes = [np.asarray(a, dtype=float) for a in (dt_values, k_over_m_values, q0_values, v0_values)]
+    if np.any(axes[0] <= 0):
+        raise ValueError("Time steps must be positive")
+    # Every row of a chunk has its own dt, which only the stateless Euler steppers handle
+    unsupported = [method for method in methods if method not in EULER_METHODS]
+    if unsupported:
+        raise ValueError(f"Unsupported sweep methods {unsupported}; choose from {EULER_METHODS}")
+    grid_shape = tuple(len(a) for a in axes)
+    num_points = int(np.prod(grid_shape))
+
+    output = np.lib.format.open_memmap(path, mode="w+", shape=(num_points, len(methods), 2))
+    np.savez(f"{path}.axes.npz", dt=axes[0], k_over_m=axes[1], q0=axes[2], v0=axes[3],
+             methods=np.array(methods))
+
+    def chunk_params(start):
+        # Build the chunk's rows from flat grid indices instead of materializing the grid
+        index = np.unravel_index(np.arange(start, min(start + chunk_size, num_points)), grid_shape)
+        return np.stack([a[i] for a, i in zip(axes, index)], axis=1)
+
+    workers = workers or os.cpu_count()
+    starts = iter(range(0, num_points, chunk_size))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        while True:
+            # Keep a bounded number of chunks in flight so huge grids never queue up in memory
+            for start in starts:
+                future = pool.submit(run_chunk, chunk_params(start), methods, total_time, blowup_ratio)
+                pending[future] = start
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                chunk = future.result()
+                output[start:start + len(chunk)] = chunk
+            output.flush()
+
+    del output
+    return np.load(path, mmap_mode="r").reshape(grid_shape + (len(methods), 2))
+
+
+def _axis(values):
+    # A list of values, where "start:stop:num" expands to an evenly spaced range
+    axis = []
+    for value in values:
+        if ":" in value:
+            start, stop, num = value.split(":")
+            axis.extend(np.linspace(float(start), float(stop), int(num)))
+        else:
+            axis.append(float(value))
+    return np.array(axis)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stability sweep of the Euler schemes")
+    parser.add_argument("output", help="Output .npy file")
+    parser.add_argument("--dt", nargs="+", default=["0.01:1.0:100"])
+    parser.add_argument("--k-over-m", nargs="+", default=["0.25:4.0:100"])
+    parser.add_argument("--q0", nargs="+", default=["2.0"])
+    parser.add_argument("--v0", nargs="+", default=["0.0"])
+    parser.add_argument("--methods", nargs="+", choices=EULER_METHODS, default=list(EULER_METHODS))
+    parser.add_argument("--total-time", type=float, default=20.0)
+    parser.add_argument("--blowup-ratio", type=float, default=100.0)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    result = sweep(args.output, _axis(args.dt), _axis(args.k_over_m), _axis(args.q0), _axis(args.v0),
+                   methods=args.methods, total_time=args.total_time, blowup_ratio=args.blowup_ratio,
+                   chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Wrote {result.shape} stability map to {args.output}")
+    for m, method in enumerate(args.methods):
+        unstable = np.mean(np.isfinite(result[..., m, BLOWUP_TIME]))
+        print(f"{method:>18}: {unstable:.1%} of runs blew up")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from integrators import IntegrationStream
+
+# Memory-mapped trajectory storage for long simulations.
+#
+# A trajectory of shape (steps + 1, N, 2) is written to a regular .npy file in
+# fixed-size chunks while the integrator runs: only one chunk of states lives in
+# RAM, the rest is on disk. Reading goes through np.load(mmap_mode="r"), so
+# scenes can slice or stream an already computed run without recomputing it.
+
+
+def record(path, initial_states, dt, steps, k_over_m=1.0, method="forward_euler", chunk_steps=65536):
+    """Integrate and write the full (steps + 1, N, 2) trajectory to `path`.
+
+    Returns a read-only memmap of the result.
+    """
+    states = np.atleast_2d(np.asarray(initial_states, dtype=float))
+    shape = (steps + 1,) + states.shape
+
+    # Write to a temporary name so an interrupted run never looks complete
+    partial = f"{path}.partial"
+    output = np.lib.format.open_memmap(partial, mode="w+", shape=shape)
+
+    output[0] = states
+    written = 1
+    for chunk in IntegrationStream(states, dt, k_over_m, method, block_steps=chunk_steps, max_steps=steps):
+        output[written:written + len(chunk)] = chunk
+        written += len(chunk)
+    output.flush()
+    del output
+
+    os.replace(partial, path)
+    return load(path)
+
+
+def load(path):
+    """Open a stored trajectory lazily as a read-only memmap."""
+    return np.load(path, mmap_mode="r")
+
+
+def sample(trajectory, dt, t):
+    """State at time(s) `t`, linearly interpolated between the stored steps.
+
+    Times outside the recorded span are clamped to its ends. Works on memmaps
+    too, touching only the two steps around each requested time.
+    """
+    last = len(trajectory) - 1
+    position = np.clip(np.asarray(t, dtype=float) / dt, 0, last)
+    index = np.minimum(np.floor(position).astype(np.int64), max(last - 1, 0))
+    fraction = (position - index).reshape(np.shape(index) + (1,) * (np.ndim(trajectory) - 1))
+    before = np.asarray(trajectory[index])
+    after = np.asarray(trajectory[np.minimum(index + 1, last)])
+    return before + fraction * (after - before)
+
+
+def iter_chunks(path, chunk_steps=65536, stride=1):
+    """Yield consecutive blocks of the stored trajectory, every `stride`-th state.
+
+    Each block is a regular in-memory array, so callers never hold more than
+    one chunk at a time.
+    """
+    trajectory = load(path)
+    for start in range(0, len(trajectory), chunk_steps * stride):
+        yield np.array(trajectory[start:start + chunk_steps * stride:stride])
+
+
+def cached_trajectory(path, initial_states, dt, steps, k_over_m=1.0, method="forward_euler", **kwargs):
+    """Load `path` if it was recorded with the same inputs, otherwise record it first.
+
+    The inputs are fingerprinted in a `<path>.json` sidecar, which lets repeated
+    renders (light and dark themes, say) reuse one simulation.
+    """
+    states = np.atleast_2d(np.asarray(initial_states, dtype=float))
+    key = _run_key(states, dt, steps, k_over_m, method)
+    sidecar = f"{path}.json"
+    if os.path.exists(path) and os.path.exists(sidecar):
+        with open(sidecar) as f:
+            if json.load(f).get("key") == key:
+                return load(path)
+
+    trajectory = record(path, states, dt, steps, k_over_m, method, **kwargs)
+    with open(sidecar, "w") as f:
+        json.dump({"key": key, "method": method if isinstance(method, str) else method.__name__,
+                   "dt": dt, "steps": steps}, f)
+    return trajectory
+
+
+def _run_key(states, dt, steps, k_over_m, method):
+    digest = hashlib.sha1()
+    digest.update(states.tobytes())
+    digest.update(np.asarray(k_over_m, dtype=float).tobytes())
+    name = method if isinstance(method, str) else method.__name__
+    digest.update(f"{name}|{dt!r}|{steps}".encode())
+    return digest.hexdigest()